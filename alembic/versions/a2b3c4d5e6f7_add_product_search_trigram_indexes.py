@@ -0,0 +1,48 @@
+"""Add trigram indexes for admin product search
+
+Revision ID: a2b3c4d5e6f7
+Revises: z1a2b3c4d5e6
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2b3c4d5e6f7'
+down_revision: Union[str, None] = 'z1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns matched by the admin product and inventory searches (ILIKE '%term%')
+PRODUCT_SEARCH_COLUMNS = ['name', 'brand', 'seller_sku']
+
+
+def upgrade() -> None:
+    """
+    GIN trigram indexes let Postgres answer ILIKE '%term%' without a full scan.
+    PostgreSQL only - SQLite (local dev) has no pg_trgm, so this is a no-op there.
+    """
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in PRODUCT_SEARCH_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_products_{column}_trgm "
+            f"ON products USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    
+    for column in PRODUCT_SEARCH_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_products_{column}_trgm")
@@ -0,0 +1,43 @@
+"""Add covering index for single-access token lookups
+
+Revision ID: b3c4d5e6f7a8
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c4d5e6f7a8'
+down_revision: Union[str, None] = 'a2b3c4d5e6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    validate_single_access_token looks a token up by value and reads only
+    user_id, redirect_url and expires_at; carrying them in the index lets
+    Postgres answer that with an index-only scan.
+    PostgreSQL only (INCLUDE needs PG 11+) - a no-op on SQLite (local dev).
+    """
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_single_access_tokens_token_covering "
+        "ON single_access_tokens (token) INCLUDE (user_id, redirect_url, expires_at)"
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    
+    op.execute("DROP INDEX IF EXISTS ix_single_access_tokens_token_covering")
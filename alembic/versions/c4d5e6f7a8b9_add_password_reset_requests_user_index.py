@@ -0,0 +1,37 @@
+"""Add (user_id, created_at) index to password_reset_requests
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-17 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'b3c4d5e6f7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX_NAME = 'ix_password_reset_requests_user_created'
+
+
+def upgrade() -> None:
+    """Backs the per-user "requests in the last hour" rate-limit count"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    # Tables may have been created by Base.metadata.create_all with the index already
+    existing = {ix['name'] for ix in inspector.get_indexes('password_reset_requests')}
+    if INDEX_NAME not in existing:
+        op.create_index(INDEX_NAME, 'password_reset_requests', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='password_reset_requests')
@@ -0,0 +1,48 @@
+"""Add trigram indexes for admin user search
+
+Revision ID: y0z1a2b3c4d5
+Revises: cffe045f7b43
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'y0z1a2b3c4d5'
+down_revision: Union[str, None] = 'cffe045f7b43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns matched by the admin user search (ILIKE '%term%')
+USER_SEARCH_COLUMNS = ['phone', 'whatsapp_phone', 'email', 'first_name', 'last_name']
+
+
+def upgrade() -> None:
+    """
+    GIN trigram indexes let Postgres answer ILIKE '%term%' without a full scan.
+    PostgreSQL only - SQLite (local dev) has no pg_trgm, so this is a no-op there.
+    """
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in USER_SEARCH_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_users_{column}_trgm "
+            f"ON users USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    
+    for column in USER_SEARCH_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_users_{column}_trgm")
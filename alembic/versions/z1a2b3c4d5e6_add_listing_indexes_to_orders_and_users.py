@@ -0,0 +1,44 @@
+"""Add listing indexes to orders and users
+
+Revision ID: z1a2b3c4d5e6
+Revises: y0z1a2b3c4d5
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'z1a2b3c4d5e6'
+down_revision: Union[str, None] = 'y0z1a2b3c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_orders_created_at_id', 'orders', ['created_at', 'id']),
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Indexes backing the admin listings ordered by created_at"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    for name, table, columns in INDEXES:
+        # Tables may have been created by Base.metadata.create_all with the index already
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -47,6 +47,10 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
 PASSWORD_RESET_MAX_REQUESTS_PER_HOUR = int(os.getenv("PASSWORD_RESET_MAX_REQUESTS_PER_HOUR", "3"))
 
+# bcrypt work factor for new password hashes (existing hashes keep the cost they
+# were created with). Each +1 doubles hashing/login CPU time.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 # Stripe Configuration
 STRIPE_SECRET_KEY = _get_secret("STRIPE_SECRET_KEY", "")
 STRIPE_WEBHOOK_SECRET = _get_secret("STRIPE_WEBHOOK_SECRET", "")
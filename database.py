@@ -1,7 +1,10 @@
 import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, raiseload
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.types import DateTime
 
 # Load .env file before reading DATABASE_URL
 env_file = os.getenv("ENV_FILE", ".env.dev")
@@ -10,16 +13,38 @@ load_dotenv(env_file)
 # Use DATABASE_URL from environment, fallback to SQLite for local development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./api_db.sqlite3")
 
+# Size of SQLAlchemy's compiled-statement cache (default 500). The API issues a
+# few hundred distinct statements, so leave headroom to avoid recompiling.
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
+# ORM_RAISELOAD=1 (for tests/CI) makes the user queries in the auth and admin
+# services raise on any lazy relationship load instead of silently issuing a
+# SELECT per row. Off in production, where the lazy load is the safety net.
+ORM_RAISELOAD = os.getenv("ORM_RAISELOAD", "").lower() in ("1", "true", "yes")
+RAISELOAD_OPTIONS = (raiseload("*", sql_only=True),) if ORM_RAISELOAD else ()
+
 # SQLite requires special connect_args
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
 elif DATABASE_URL.startswith("postgresql://"):
     # Convert to pg8000 driver (pure Python, no system dependencies)
     pg8000_url = DATABASE_URL.replace("postgresql://", "postgresql+pg8000://")
-    engine = create_engine(pg8000_url)
+    # Sync routes run in FastAPI's threadpool (40 threads by default), so the
+    # pool size is what actually caps concurrent requests hitting the DB.
+    engine = create_engine(
+        pg8000_url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
 else:
     # Other databases (MySQL, etc.)
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, query_cache_size=QUERY_CACHE_SIZE)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -30,3 +55,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time evaluated by the database, matching the naive-UTC values
+    datetime.utcnow() writes. Lets timestamp bumps go out as plain SQL.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 import traceback
 import logging
 from contextlib import asynccontextmanager
@@ -146,6 +147,20 @@ def init_store_settings():
         print(f"[WARN] Could not initialize store settings: {e}")
 
 
+async def flush_app_last_used_periodically():
+    """Background loop writing batched application last_used_at values"""
+    from services.admin_service import flush_app_last_used, APP_LAST_USED_FLUSH_INTERVAL_SECONDS
+    
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(APP_LAST_USED_FLUSH_INTERVAL_SECONDS)
+        try:
+            # Sync DB work, keep it off the event loop
+            await loop.run_in_executor(None, flush_app_last_used)
+        except Exception as e:
+            logger.warning(f"Could not flush application last_used_at: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -172,10 +187,18 @@ async def lifespan(app: FastAPI):
         logger.error(f"[ERROR] Could not initialize store settings: {e}")
         logger.error(traceback.format_exc())
     
+    last_used_task = asyncio.create_task(flush_app_last_used_periodically())
+    
     logger.info("[OK] Application startup complete")
     yield
-    # Shutdown (nothing to do)
+    # Shutdown: stop the background flush and write whatever is still pending
     logger.info("[SHUTDOWN] Application shutting down")
+    last_used_task.cancel()
+    try:
+        from services.admin_service import flush_app_last_used
+        flush_app_last_used()
+    except Exception as e:
+        logger.error(f"[ERROR] Could not flush application last_used_at: {e}")
 
 
 # Initialize app
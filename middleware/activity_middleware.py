@@ -349,11 +349,12 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             try:
-                from jose import jwt, JWTError
-                from config import SECRET_KEY, ALGORITHM
+                from security import decode_bearer_token, JWTError
                 
                 token = auth_header.split(" ")[1]
-                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+                payload = decode_bearer_token(token)
+                # Shared with the auth dependencies so the token is decoded once per request
+                request.state.jwt_payload = payload
                 identifier = payload.get("sub")
                 token_type = payload.get("type")  # "app" or None (user)
                 
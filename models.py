@@ -36,6 +36,11 @@ class User(Base):
     password_reset_requests = relationship("PasswordResetRequest", back_populates="user")
     # Relationship to single access tokens
     single_access_tokens = relationship("SingleAccessToken", back_populates="user")
+    
+    # Index for admin user listing (newest first)
+    __table_args__ = (
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
 class Product(Base):
     __tablename__ = "products"
@@ -97,7 +102,10 @@ class Product(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship to variant groups
-    variant_groups = relationship("ProductVariantGroup", back_populates="product", cascade="all, delete-orphan")
+    variant_groups = relationship(
+        "ProductVariantGroup", back_populates="product", cascade="all, delete-orphan",
+        order_by="(ProductVariantGroup.display_order, ProductVariantGroup.id)"
+    )
     # Relationship to categories (many-to-many)
     product_categories = relationship("ProductCategory", back_populates="product", cascade="all, delete-orphan")
 
@@ -113,7 +121,10 @@ class ProductVariantGroup(Base):
     display_order = Column(Integer, default=0)  # For sorting groups
     
     product = relationship("Product", back_populates="variant_groups")
-    variants = relationship("ProductVariant", back_populates="group", cascade="all, delete-orphan")
+    variants = relationship(
+        "ProductVariant", back_populates="group", cascade="all, delete-orphan",
+        order_by="(ProductVariant.display_order, ProductVariant.id)"
+    )
 
 
 class ProductVariant(Base):
@@ -148,6 +159,11 @@ class PasswordResetRequest(Base):
 
     user = relationship("User", back_populates="password_reset_requests")
 
+    __table_args__ = (
+        # Per-user rate limit: count of requests in the last hour
+        Index('ix_password_reset_requests_user_created', 'user_id', 'created_at'),
+    )
+
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -181,6 +197,12 @@ class Order(Base):
     user = relationship("User")
     items = relationship("OrderItem", back_populates="order")
     shipments = relationship("OrderShipment", back_populates="order", cascade="all, delete-orphan")
+    
+    # Indexes for admin order listing (newest first, optionally by status)
+    __table_args__ = (
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+    )
 
 class OrderItem(Base):
     __tablename__ = "order_items"
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
@@ -45,6 +47,16 @@ from schemas.settings import (
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model in one pass with pydantic-core.
+    Returning a Response skips FastAPI's response_model re-validation and
+    jsonable_encoder walk, which dominate on large list payloads; the
+    route's response_model is still used for the OpenAPI schema.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
 # ==================== APPLICATION MANAGEMENT ====================
 # These endpoints require applications:read or applications:write scope
 
@@ -137,16 +149,26 @@ def rotate_secret(
     "/products",
     response_model=List[ProductAdminResponse],
     summary="List all products",
-    description="Get a list of all products with optional filters."
+    description="""Get a list of all products with optional filters.
+    Pass limit to page by keyset: the X-Next-Cursor response header holds the cursor for the next page (absent on the last page)."""
 )
 def list_products(
+    response: Response,
     search: Optional[str] = Query(None, description="Search by name or brand"),
     brand: Optional[str] = Query(None, description="Filter by brand"),
     is_in_stock: Optional[bool] = Query(None, description="Filter by stock status"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit to return every product)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    include_variants: bool = Query(True, description="Include variant_types and categories (false for a lean listing)"),
     app=Depends(admin_service.require_scope("products:read")),
     db: Session = Depends(get_db)
 ):
-    return admin_service.list_products(db, search, brand, is_in_stock)
+    products, next_cursor = admin_service.list_products(
+        db, search, brand, is_in_stock, limit, cursor, include_variants
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return products
 
 
 @router.get(
@@ -195,14 +217,16 @@ def bulk_create_products(
     "/products/bulk",
     response_model=ProductBulkUpdateResponse,
     summary="Update multiple products",
-    description="Update multiple products at once (inventory, prices, etc.). Only provided fields will be updated."
+    description="""Update multiple products at once (inventory, prices, etc.). Only provided fields will be updated.
+    Pass include_products=false to get only the per-item results (id, seller_sku, updated_fields) without the full products."""
 )
 def bulk_update_products(
     data: ProductBulkUpdate,
+    include_products: bool = Query(True, description="Return the full updated products (false for a lean response)"),
     app=Depends(admin_service.require_scope("products:write")),
     db: Session = Depends(get_db)
 ):
-    return admin_service.bulk_update_products(data, db)
+    return admin_service.bulk_update_products(data, db, include_products)
 
 
 @router.delete(
@@ -366,10 +390,14 @@ def list_orders(
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(True, description="Compute total_items/total_pages (skip for faster paging, use has_next instead)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset paging, ignores page)"),
     app=Depends(admin_service.require_scope("orders:read")),
     db: Session = Depends(get_db)
 ):
-    return admin_service.list_orders(db, status, payment_status, user_id, page, page_size)
+    return _json_response(
+        admin_service.list_orders(db, status, payment_status, user_id, page, page_size, include_total, cursor)
+    )
 
 
 # IMPORTANT: Specific routes must come BEFORE the generic /orders/{order_id} route
@@ -542,7 +570,7 @@ def get_stats(
     app=Depends(admin_service.require_scope("stats:read")),
     db: Session = Depends(get_db)
 ):
-    return admin_service.get_admin_stats(db)
+    return _json_response(admin_service.get_admin_stats(db))
 
 
 # ==================== USER MANAGEMENT ====================
@@ -576,10 +604,12 @@ def list_users(
     registration_complete: Optional[bool] = Query(None, description="Filter by registration status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(True, description="Compute total_items/total_pages (skip for faster paging, use has_next instead)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset paging, ignores page)"),
     app=Depends(admin_service.require_scope("users:read")),
     db: Session = Depends(get_db)
 ):
-    return admin_service.list_users(db, search, user_type, registration_complete, page, page_size)
+    return admin_service.list_users(db, search, user_type, registration_complete, page, page_size, include_total, cursor)
 
 
 # ==================== USER ACTIVITY TRACKING ====================
@@ -3,10 +3,9 @@ from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
-from jose import jwt, JWTError
 from database import get_db
 from models import User
-from config import SECRET_KEY, ALGORITHM
+from security import decode_token, JWTError
 from services import checkout_service, auth_service
 from services import shipping_service
 
@@ -47,7 +46,7 @@ def get_optional_user(
         return None
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         identifier = payload.get("sub")
         if not identifier:
             return None
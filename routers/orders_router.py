@@ -6,11 +6,10 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import Optional
-from jose import jwt, JWTError
 
 from database import get_db
 from models import User
-from config import SECRET_KEY, ALGORITHM
+from security import decode_token, JWTError
 from services import checkout_service
 from schemas.checkout import OrderCreate
 
@@ -34,7 +33,7 @@ def get_optional_user(
         return None
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         identifier = payload.get("sub")
         if not identifier:
             return None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime, date
 
 
@@ -440,11 +440,19 @@ class ProductBulkUpdateError(BaseModel):
     error: str
 
 
+class ProductBulkUpdateItemResponse(BaseModel):
+    """Lean per-product result of a bulk update"""
+    id: int
+    seller_sku: Optional[str] = None
+    updated_fields: List[str] = []
+
+
 class ProductBulkUpdateResponse(BaseModel):
     updated: int
     failed: int
     errors: List[ProductBulkUpdateError] = []
-    products: List[ProductAdminResponse] = []
+    items: List[ProductBulkUpdateItemResponse] = []
+    products: List[ProductAdminResponse] = []  # Empty when include_products=false
 
 
 # ---------- Order Admin Schemas ----------
@@ -571,8 +579,14 @@ class OrderAdminResponse(BaseModel):
         from_attributes = True
 
 
+OrderStatus = Literal[
+    "pending", "pending_payment", "processing_payment", "pending_verification", "awaiting_verification",
+    "paid", "payment_failed", "processing", "shipped", "delivered", "canceled", "refunded"
+]
+
+
 class OrderStatusUpdate(BaseModel):
-    status: str  # pending, pending_payment, processing_payment, pending_verification, awaiting_verification, paid, payment_failed, processing, shipped, delivered, canceled, refunded
+    status: OrderStatus  # Validated by pydantic; unknown values are rejected with 422
 
 
 class OrdersFilterParams(BaseModel):
@@ -586,8 +600,10 @@ class OrdersFilterParams(BaseModel):
 class PaginatedOrdersResponse(BaseModel):
     page: int
     page_size: int
-    total_items: int
-    total_pages: int
+    total_items: Optional[int] = None  # None when requested with include_total=false
+    total_pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None  # Pass back as cursor for keyset paging
     results: List[OrderAdminResponse]
 
 
@@ -650,8 +666,10 @@ class UserAdminCreatedResponse(UserAdminResponse):
 class PaginatedUsersResponse(BaseModel):
     page: int
     page_size: int
-    total_items: int
-    total_pages: int
+    total_items: Optional[int] = None  # None when requested with include_total=false
+    total_pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None  # Pass back as cursor for keyset paging
     results: List[UserAdminResponse]
 
 
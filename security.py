@@ -1,15 +1,60 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
+from jose import jwt, jwk, JWTError, ExpiredSignatureError
 from config import SECRET_KEY, ALGORITHM
+from utils.cache import TTLCache
+
+# All JWT signing/verification goes through this module (encode_token,
+# decode_token, decode_bearer_token, JWTError, ExpiredSignatureError), so the JWT library is only referenced here.
+
+# Build the jose key objects once; passing the raw secret makes jose
+# re-construct (and for RS/ES/PS, re-parse the PEM of) the key on every call.
+SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+VERIFY_KEY = SIGNING_KEY if ALGORITHM.startswith("HS") else SIGNING_KEY.public_key()
+_ALGORITHMS = [ALGORITHM]
+
+# Every bearer token we mint (user and app access tokens) carries exp and sub;
+# reject any that does not, wherever the Authorization header is decoded.
+BEARER_TOKEN_DECODE_OPTIONS = {"require_exp": True, "require_sub": True}
+
+def encode_token(claims: dict) -> str:
+    """Sign a JWT with the app secret using the pre-built key"""
+    return jwt.encode(claims, SIGNING_KEY, algorithm=ALGORITHM)
+
+def decode_token(token: str, options: dict = None) -> dict:
+    """Verify and decode a JWT using the pre-built key (raises JWTError).
+    `options` is passed through to jose, e.g. {"require_exp": True}."""
+    return jwt.decode(token, VERIFY_KEY, algorithms=_ALGORITHMS, options=options)
+
+# Verified bearer-token claims keyed by a BLAKE2b digest of the token (so the
+# cache does not hold bearer credentials). ActivityTrackingMiddleware and the
+# auth dependencies both decode through here, so a request pays for at most
+# one signature check and a client reusing its token usually pays none.
+# Entries never outlive the token's own exp; only verified tokens are cached.
+BEARER_TOKEN_CACHE_TTL_SECONDS = 300
+_bearer_token_cache = TTLCache(maxsize=10000, ttl=BEARER_TOKEN_CACHE_TTL_SECONDS)
+
+def decode_bearer_token(token: str) -> dict:
+    """decode_token with BEARER_TOKEN_DECODE_OPTIONS, reusing a recent decode of the same token"""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _bearer_token_cache.get(key)
+    if payload is not None:
+        return payload
+    payload = decode_token(token, BEARER_TOKEN_DECODE_OPTIONS)
+    ttl = min(BEARER_TOKEN_CACHE_TTL_SECONDS, payload["exp"] - time.time())
+    if ttl > 0:
+        _bearer_token_cache.set(key, payload, ttl=ttl)
+    return payload
 
 def create_reset_token(data: dict, expires_minutes: int = 60):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
     to_encode.update({"exp": int(expire.timestamp())})  # ✅ convertimos a UNIX timestamp
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encode_token(to_encode)
 
 def verify_reset_token(token: str):
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return decode_token(token)
     except JWTError:
         return None
@@ -2,18 +2,24 @@ from __future__ import annotations
 
 import secrets
 import hashlib
+import hmac
 import logging
+import base64
+import json
+import threading
+import time
+from itertools import chain
 from datetime import datetime, timedelta
-from typing import Optional, List
-from fastapi import HTTPException, Depends
+from typing import Optional, List, NamedTuple, Sequence
+from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from jose import jwt, JWTError
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event, func, select, insert, update, case, and_, or_, tuple_
 
 logger = logging.getLogger("landa-api.admin")
 
-from database import get_db
+from database import get_db, utcnow, SessionLocal, RAISELOAD_OPTIONS
 from models import (
     Application, Product, ProductVariantGroup, ProductVariant, 
     Order, OrderItem, OrderShipment, User, SingleAccessToken,
@@ -29,6 +35,7 @@ from schemas.admin import (
     ProductBulkCreate, ProductBulkResponse, ProductBulkError,
     ProductBulkDelete, ProductBulkDeleteResponse, ProductBulkDeleteError,
     ProductBulkUpdate, ProductBulkUpdateItem, ProductBulkUpdateResponse, ProductBulkUpdateError,
+    ProductBulkUpdateItemResponse,
     VariantBulkDelete, VariantBulkDeleteResponse, VariantBulkDeleteError,
     OrderAdminResponse, OrderItemResponse, OrderStatusUpdate, PaginatedOrdersResponse,
     RecipientAddress, RecipientAddressDistrictInfo,
@@ -55,13 +62,16 @@ from schemas.admin import (
     RegistrationRequestRejectRequest, RegistrationRequestApproveResponse,
     RegistrationRequestRejectResponse, RegistrationRequestReviewerResponse
 )
-from config import SECRET_KEY, ALGORITHM, WHOLESALE_FRONTEND_URL, SINGLE_ACCESS_TOKEN_EXPIRE_HOURS
+from config import WHOLESALE_FRONTEND_URL, SINGLE_ACCESS_TOKEN_EXPIRE_HOURS, BCRYPT_ROUNDS
+from security import encode_token, decode_bearer_token, JWTError
+from utils.cache import TTLCache
 
 # Security scheme for OAuth2 Bearer tokens
 oauth2_bearer = HTTPBearer()
 
 # Token expiration (2 hours)
 ACCESS_TOKEN_EXPIRE_MINUTES = 120
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
 # Available scopes
 AVAILABLE_SCOPES = [
@@ -80,151 +90,264 @@ AVAILABLE_SCOPES = [
     "settings:write",
 ]
 
+# Set view for O(1) membership checks when validating scopes
+AVAILABLE_SCOPES_SET = frozenset(AVAILABLE_SCOPES)
+INVALID_SCOPE_DETAIL = f"Available: {AVAILABLE_SCOPES} or use '*' for all"
+# Immutable snapshot handed out for '*' (AVAILABLE_SCOPES itself stays mutable for
+# callers). Shared rather than copied: it cannot be edited in place, and the JSON
+# column and response models read it like a list.
+_ALL_SCOPES_TUPLE = tuple(AVAILABLE_SCOPES)
+
 # Special scope that grants all permissions
 WILDCARD_SCOPE = "*"
 
+# Bit per scope for the "sc" claim of app tokens, so a scope check is a single AND.
+# Bits follow AVAILABLE_SCOPES order: only ever append new scopes to the list.
+SCOPE_BITS = {scope: 1 << i for i, scope in enumerate(AVAILABLE_SCOPES)}
+ALL_SCOPES_MASK = (1 << len(AVAILABLE_SCOPES)) - 1
+
+
+def scopes_to_mask(scopes: list) -> int:
+    """Bitmask of the given scopes ('*' grants every scope)"""
+    if WILDCARD_SCOPE in scopes:
+        return ALL_SCOPES_MASK
+    mask = 0
+    for scope in scopes:
+        mask |= SCOPE_BITS.get(scope, 0)
+    return mask
+
 
-def expand_scopes(scopes: list) -> list:
+def expand_scopes(scopes: list) -> Sequence[str]:
     """Expand wildcard scope to all available scopes"""
     if WILDCARD_SCOPE in scopes:
-        return AVAILABLE_SCOPES.copy()
+        return _ALL_SCOPES_TUPLE
     return scopes
 
 
 def generate_client_id() -> str:
     """Generate a unique client_id like 'app_xxxxxx'"""
-    return f"app_{secrets.token_hex(12)}"
+    return f"app_{secrets.token_urlsafe(12)}"
 
 
 def generate_client_secret() -> str:
     """Generate a secure client_secret like 'sk_live_xxxxxx'"""
-    return f"sk_live_{secrets.token_hex(32)}"
+    return f"sk_live_{secrets.token_urlsafe(32)}"
+
+
+# Prefix of the current client_secret hash format; unprefixed hashes are legacy SHA-256
+SECRET_HASH_PREFIX = "b2$"
 
 
 def hash_secret(secret: str) -> str:
     """Hash the client_secret for storage"""
+    return SECRET_HASH_PREFIX + hashlib.blake2b(secret.encode(), digest_size=32).hexdigest()
+
+
+def _hash_secret_legacy(secret: str) -> str:
     return hashlib.sha256(secret.encode()).hexdigest()
 
 
+def secret_hash_needs_upgrade(hashed_secret: str) -> bool:
+    """True if the stored hash still uses the legacy SHA-256 format"""
+    return not hashed_secret.startswith(SECRET_HASH_PREFIX)
+
+
 def verify_secret(plain_secret: str, hashed_secret: str) -> bool:
-    """Verify a client_secret against its hash"""
-    return hash_secret(plain_secret) == hashed_secret
+    """Verify a client_secret against its hash (current or legacy format)"""
+    if secret_hash_needs_upgrade(hashed_secret):
+        return hmac.compare_digest(_hash_secret_legacy(plain_secret), hashed_secret)
+    return hmac.compare_digest(hash_secret(plain_secret), hashed_secret)
 
 
 def create_app_access_token(app: Application) -> tuple[str, int]:
     """Create a JWT access token for an application"""
-    expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    expire = datetime.utcnow() + expires_delta
-    
+    scopes = app.scopes or []
     to_encode = {
         "sub": app.client_id,
         "type": "app",
-        "scopes": app.scopes or [],
-        "exp": expire
+        "scopes": scopes,
+        "sc": scopes_to_mask(scopes),
+        "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS
     }
     
-    token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return token, ACCESS_TOKEN_EXPIRE_MINUTES * 60  # return seconds
+    token = encode_token(to_encode)
+    return token, ACCESS_TOKEN_EXPIRE_SECONDS
 
 
-def get_current_app(
-    credentials: HTTPAuthorizationCredentials = Depends(oauth2_bearer),
-    db: Session = Depends(get_db)
-) -> Application:
-    """Dependency to get the current authenticated application from token"""
-    token = credentials.credentials
-    
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Invalid or expired token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+# last_used_at is bookkeeping only, so instead of an UPDATE + COMMIT on every
+# authenticated request we remember the latest use per client_id here and
+# write them all in one statement from flush_app_last_used().
+APP_LAST_USED_FLUSH_INTERVAL_SECONDS = 30
+_pending_app_last_used: dict = {}
+_pending_app_last_used_lock = threading.Lock()
+
+
+def _record_app_use(client_id: str) -> None:
+    """Remember that an application just authenticated"""
+    with _pending_app_last_used_lock:
+        _pending_app_last_used[client_id] = datetime.utcnow()
+
+
+def flush_app_last_used() -> int:
+    """
+    Write pending last_used_at values with a single UPDATE ... CASE.
+    Runs from the background task started in main.py (and on shutdown).
+    Returns the number of applications updated.
+    """
+    with _pending_app_last_used_lock:
+        pending = dict(_pending_app_last_used)
+        _pending_app_last_used.clear()
+    if not pending:
+        return 0
     
+    db = SessionLocal()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        client_id: str = payload.get("sub")
-        token_type: str = payload.get("type")
-        
-        if client_id is None or token_type != "app":
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
+        db.execute(
+            update(Application)
+            .where(Application.client_id.in_(list(pending)))
+            .values(last_used_at=case(pending, value=Application.client_id))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not flush application last_used_at: {e}")
+        return 0
+    finally:
+        db.close()
+    return len(pending)
+
+
+# Built lazily on the failure paths only; the successful auth path allocates no exception
+_BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+
+def _invalid_app_token() -> HTTPException:
+    return HTTPException(status_code=401, detail="Invalid or expired token", headers=_BEARER_CHALLENGE)
+
+
+# client_id -> id of the active Application. Cleared for an app when it is
+# updated, deactivated or its secret rotated; other workers pick the change up
+# within the TTL.
+_active_app_cache = TTLCache(maxsize=512, ttl=30)
+
+
+def _active_app_id(client_id: str, db: Session) -> Optional[int]:
+    """Id of the active application with this client_id, or None"""
+    app_id = _active_app_cache.get(client_id)
+    if app_id is None:
+        # Only the id is needed to authorize, don't hydrate the whole row
+        app_id = db.query(Application.id).filter(
+            Application.client_id == client_id,
+            Application.is_active == True
+        ).scalar()
+        if app_id is not None:
+            _active_app_cache.set(client_id, app_id)
+    return app_id
+
+
+def _app_token_payload(request: Request, token: str) -> dict:
+    """
+    Claims of the request's bearer token, decoded at most once per request.
+    ActivityTrackingMiddleware already decodes the header through the same
+    cached decode_bearer_token (so exp and sub are guaranteed) and leaves the
+    payload on request.state; otherwise decode here and store it there.
+    """
+    payload = getattr(request.state, "jwt_payload", None)
+    if payload is None:
+        try:
+            payload = decode_bearer_token(token)
+        except JWTError:
+            raise _invalid_app_token()
+        request.state.jwt_payload = payload
+    return payload
+
+
+class AuthenticatedApp(NamedTuple):
+    """Calling application as resolved by the auth dependencies (scopes come from the token)"""
+    id: int
+    client_id: str
+    scopes: list
+
+
+def _authenticate_app(
+    request: Request,
+    token: str,
+    db: Session,
+    required_scope: Optional[str] = None,
+    required_mask: int = 0
+) -> AuthenticatedApp:
+    """
+    Shared body of the app auth dependencies: one decode per request (see
+    _app_token_payload), claim checks, optional scope check, active-app lookup.
+    """
+    payload = _app_token_payload(request, token)
     
-    app = db.query(Application).filter(
-        Application.client_id == client_id,
-        Application.is_active == True
-    ).first()
+    client_id: str = payload.get("sub")
+    if client_id is None or payload.get("type") != "app":
+        raise _invalid_app_token()
     
-    if app is None:
-        raise credentials_exception
+    scopes: list = payload.get("scopes", [])
+    if required_mask:
+        granted = payload.get("sc")
+        if granted is None:
+            # Token issued before the "sc" claim existed; derive it once (payloads are cached)
+            granted = payload["sc"] = scopes_to_mask(scopes)
+        if not granted & required_mask:
+            raise HTTPException(status_code=403, detail=f"Insufficient scope. Required: {required_scope}")
     
-    # Update last_used_at
-    app.last_used_at = datetime.utcnow()
-    db.commit()
+    app_id = _active_app_id(client_id, db)
+    if app_id is None:
+        raise HTTPException(status_code=401, detail="Application not found or inactive")
     
-    return app
+    # Update last_used_at (batched, see flush_app_last_used)
+    _record_app_use(client_id)
+    
+    return AuthenticatedApp(id=app_id, client_id=client_id, scopes=scopes)
+
+
+def get_current_app(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_bearer),
+    db: Session = Depends(get_db)
+) -> AuthenticatedApp:
+    """Dependency to get the current authenticated application from token"""
+    return _authenticate_app(request, credentials.credentials, db)
 
 
 def require_scope(required_scope: str):
     """Dependency factory to require a specific scope"""
+    required_mask = SCOPE_BITS[required_scope]
+    
     def scope_checker(
+        request: Request,
         credentials: HTTPAuthorizationCredentials = Depends(oauth2_bearer),
         db: Session = Depends(get_db)
-    ) -> Application:
-        token = credentials.credentials
-        
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            scopes: list = payload.get("scopes", [])
-            client_id: str = payload.get("sub")
-            
-            # Check if has wildcard or specific scope
-            has_permission = WILDCARD_SCOPE in scopes or required_scope in scopes
-            if not has_permission:
-                raise HTTPException(
-                    status_code=403,
-                    detail=f"Insufficient scope. Required: {required_scope}"
-                )
-                
-        except JWTError:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid or expired token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        app = db.query(Application).filter(
-            Application.client_id == client_id,
-            Application.is_active == True
-        ).first()
-        
-        if app is None:
-            raise HTTPException(status_code=401, detail="Application not found or inactive")
-        
-        # Update last_used_at
-        app.last_used_at = datetime.utcnow()
-        db.commit()
-        
-        return app
+    ) -> AuthenticatedApp:
+        return _authenticate_app(request, credentials.credentials, db, required_scope, required_mask)
     
     return scope_checker
 
 
 # ---------- Application Management ----------
 
+def _validate_scopes(scopes: list) -> None:
+    """Reject the request listing every unknown scope at once"""
+    invalid = set(scopes) - AVAILABLE_SCOPES_SET
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid scopes: {sorted(invalid)}. {INVALID_SCOPE_DETAIL}"
+        )
+
+
 def create_application(data: ApplicationCreate, db: Session) -> ApplicationCreatedResponse:
     """Create a new OAuth2 application"""
     # Expand wildcard scope if present
     scopes = expand_scopes(data.scopes)
     
     # Validate scopes
-    for scope in scopes:
-        if scope not in AVAILABLE_SCOPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid scope: {scope}. Available: {AVAILABLE_SCOPES} or use '*' for all"
-            )
+    _validate_scopes(scopes)
     
     client_id = generate_client_id()
     client_secret = generate_client_secret()
@@ -239,11 +362,11 @@ def create_application(data: ApplicationCreate, db: Session) -> ApplicationCreat
     )
     
     db.add(app)
-    db.commit()
-    db.refresh(app)
+    db.flush()  # Assigns id; created_at is a Python-side default, so no re-SELECT is needed
     
     # Return with the plain client_secret (only shown once!)
-    return ApplicationCreatedResponse(
+    # Built before commit, which would expire the instance and force a reload
+    response = ApplicationCreatedResponse(
         id=app.id,
         client_id=app.client_id,
         client_secret=client_secret,  # Only time this is shown!
@@ -254,12 +377,15 @@ def create_application(data: ApplicationCreate, db: Session) -> ApplicationCreat
         created_at=app.created_at,
         last_used_at=app.last_used_at
     )
+    db.commit()
+    return response
 
 
 def list_applications(db: Session) -> List[ApplicationResponse]:
     """List all applications"""
-    apps = db.query(Application).all()
-    return [ApplicationResponse.model_validate(app) for app in apps]
+    # Stream rows in batches instead of materializing the full ORM list first
+    query = db.query(Application).order_by(Application.id).yield_per(500)
+    return [ApplicationResponse.model_validate(app) for app in query]
 
 
 def get_application(app_id: int, db: Session) -> ApplicationResponse:
@@ -279,32 +405,34 @@ def update_application(app_id: int, data: ApplicationUpdate, db: Session) -> App
     if data.scopes is not None:
         # Expand wildcard scope if present
         expanded_scopes = expand_scopes(data.scopes)
-        for scope in expanded_scopes:
-            if scope not in AVAILABLE_SCOPES:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid scope: {scope}. Available: {AVAILABLE_SCOPES} or use '*' for all"
-                )
+        _validate_scopes(expanded_scopes)
         data.scopes = expanded_scopes  # Replace with expanded scopes
     
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(app, field, value)
     
+    db.flush()
+    response = ApplicationResponse.model_validate(app)
     db.commit()
-    db.refresh(app)
-    return ApplicationResponse.model_validate(app)
+    _active_app_cache.pop(response.client_id)
+    return response
 
 
 def delete_application(app_id: int, db: Session) -> dict:
     """Delete (deactivate) an application"""
-    app = db.query(Application).filter(Application.id == app_id).first()
-    if not app:
+    # Single UPDATE ... RETURNING instead of loading the row to flip one flag
+    row = db.execute(
+        update(Application).where(Application.id == app_id).values(is_active=False)
+        .returning(Application.client_id, Application.name)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    app.is_active = False
     db.commit()
-    return {"msg": f"Application '{app.name}' has been deactivated"}
+    _active_app_cache.pop(row.client_id)
+    return {"msg": f"Application '{row.name}' has been deactivated"}
 
 
 def rotate_client_secret(app_id: int, db: Session) -> dict:
@@ -316,6 +444,7 @@ def rotate_client_secret(app_id: int, db: Session) -> dict:
     new_secret = generate_client_secret()
     app.client_secret_hash = hash_secret(new_secret)
     db.commit()
+    _active_app_cache.pop(app.client_id)
     
     return {
         "msg": "Client secret rotated successfully",
@@ -336,11 +465,25 @@ def authenticate_application(client_id: str, client_secret: str, db: Session) ->
     if not verify_secret(client_secret, app.client_secret_hash):
         raise HTTPException(status_code=401, detail="Invalid client credentials")
     
+    # Lazily move legacy SHA-256 hashes to the current format
+    if secret_hash_needs_upgrade(app.client_secret_hash):
+        app.client_secret_hash = hash_secret(client_secret)
+        db.commit()
+    
     return app
 
 
 # ---------- Category Management ----------
 
+def _is_unique_violation(error: IntegrityError) -> bool:
+    """True if the IntegrityError is a unique-constraint violation (Postgres or SQLite)"""
+    orig = error.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlite_errorname", None)
+    if code is None and orig is not None and orig.args and isinstance(orig.args[0], dict):
+        code = orig.args[0].get("C")  # pg8000 puts the SQLSTATE in the error fields
+    return code in ("23505", "SQLITE_CONSTRAINT_UNIQUE")
+
+
 def _process_categories(product_id: int, categories_data: List[CategoryInput], db: Session) -> None:
     """Process categories input and create/link categories to product.
     Creates category groups and categories if they don't exist (by slug).
@@ -445,13 +588,16 @@ def list_categories(db: Session) -> List[CategoryGroupResponse]:
 
 # ---------- Product Management ----------
 
-def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
+def create_product(data: ProductCreate, db: Session, commit: bool = True) -> ProductAdminResponse:
     """Create a new product with optional variant groups and categories.
     Products are created with stock=0 and is_in_stock=False.
     Use inventory endpoints to update stock.
     
     If a product with the same SKU exists but is inactive (soft-deleted),
-    it will be reactivated and updated with the new data instead of creating a duplicate."""
+    it will be reactivated and updated with the new data instead of creating a duplicate.
+    
+    Intermediate steps only flush; with commit=False the caller owns the
+    transaction (bulk_create_products commits once for the whole batch)."""
     # Extract variant groups and categories before creating product
     variant_groups_data = data.variant_groups
     categories_data = data.categories
@@ -481,8 +627,7 @@ def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
         if categories_data:
             db.query(ProductCategory).filter(ProductCategory.product_id == existing_inactive.id).delete()
         
-        db.commit()
-        db.refresh(existing_inactive)
+        db.flush()
         product = existing_inactive
         
         # Handle variant groups for reactivated product
@@ -540,8 +685,7 @@ def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
                         display_order=group_data.display_order
                     )
                     db.add(group)
-                    db.commit()
-                    db.refresh(group)
+                    db.flush()
                 
                 # Process variants
                 for idx, variant_data in enumerate(variants_data):
@@ -574,9 +718,6 @@ def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
                             **variant_dict
                         )
                         db.add(variant)
-            
-            db.commit()
-            db.refresh(product)
     else:
         # Force stock=0 and is_in_stock=False for new products
         # Stock is managed via inventory endpoints
@@ -589,11 +730,12 @@ def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
         
         product = Product(**product_data)
         db.add(product)
-        db.commit()
-        db.refresh(product)
+        db.flush()
         
         # Create variant groups and variants for new product
         if variant_groups_data:
+            # Variants of all groups go out in a single executemany INSERT
+            variant_rows = []
             for group_data in variant_groups_data:
                 variants_data = group_data.variants
                 group = ProductVariantGroup(
@@ -603,8 +745,7 @@ def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
                     display_order=group_data.display_order
                 )
                 db.add(group)
-                db.commit()
-                db.refresh(group)
+                db.flush()
                 
                 # Create variants for this group
                 for idx, variant_data in enumerate(variants_data):
@@ -615,32 +756,38 @@ def create_product(data: ProductCreate, db: Session) -> ProductAdminResponse:
                     # Use array index as display_order if not explicitly set
                     if variant_dict.get('display_order', 0) == 0:
                         variant_dict['display_order'] = idx
-                    variant = ProductVariant(
-                        group_id=group.id,
-                        **variant_dict
-                    )
-                    db.add(variant)
+                    variant_rows.append({"group_id": group.id, **variant_dict})
             
-            db.commit()
-            db.refresh(product)
+            if variant_rows:
+                db.execute(insert(ProductVariant), variant_rows)
     
     # Process categories if provided
     if categories_data:
         _process_categories(product.id, categories_data, db)
-        db.commit()
-        db.refresh(product)
     
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    # Groups/variants/categories were added by foreign key, not through the
+    # relationships, so reload the product before building the response
+    db.refresh(product)
     return _product_to_response(product)
 
 
 def bulk_create_products(data: ProductBulkCreate, db: Session) -> ProductBulkResponse:
-    """Create multiple products at once"""
+    """
+    Create multiple products at once.
+    The whole batch is one transaction with a SAVEPOINT per product, so a
+    failing product is rolled back on its own and the rest commit together.
+    """
     created_products = []
     errors = []
     
     for index, product_data in enumerate(data.products):
         try:
-            product = create_product(product_data, db)
+            with db.begin_nested():
+                product = create_product(product_data, db, commit=False)
             created_products.append(product)
         except HTTPException as e:
             errors.append(ProductBulkError(
@@ -648,16 +795,21 @@ def bulk_create_products(data: ProductBulkCreate, db: Session) -> ProductBulkRes
                 seller_sku=product_data.seller_sku,
                 error=e.detail
             ))
+        except IntegrityError as e:
+            errors.append(ProductBulkError(
+                index=index,
+                seller_sku=product_data.seller_sku,
+                error="SKU already exists" if _is_unique_violation(e) else str(e.orig)
+            ))
         except Exception as e:
-            error_msg = str(e)
-            if "UNIQUE constraint" in error_msg:
-                error_msg = "SKU already exists"
             errors.append(ProductBulkError(
                 index=index,
                 seller_sku=product_data.seller_sku,
-                error=error_msg
+                error=str(e)
             ))
     
+    db.commit()
+    
     return ProductBulkResponse(
         created=len(created_products),
         failed=len(errors),
@@ -793,14 +945,23 @@ def update_product(product_id: int, data: ProductUpdate, db: Session) -> Product
     return _product_to_response(product)
 
 
-def _product_to_response(product: Product) -> ProductAdminResponse:
-    """Convert product model to admin response with all language fields"""
+def _product_response_options():
+    """Loader options for everything _product_to_response touches (one SELECT per relationship level)"""
+    return (
+        selectinload(Product.variant_groups).selectinload(ProductVariantGroup.variants),
+        selectinload(Product.product_categories).selectinload(ProductCategory.category).selectinload(Category.group),
+    )
+
+
+def _product_to_response(product: Product, include_relations: bool = True) -> ProductAdminResponse:
+    """Convert product model to admin response with all language fields.
+    include_relations=False leaves variant_types/categories empty without loading them."""
     variant_types = []
     
-    if product.has_variants and product.variant_groups:
-        # Group by variant_type
+    if include_relations and product.has_variants and product.variant_groups:
+        # Group by variant_type (relationships are ordered by display_order in SQL)
         grouped_by_type = {}
-        for group in sorted(product.variant_groups, key=lambda g: g.display_order):
+        for group in product.variant_groups:
             vtype = group.variant_type or "General"
             if vtype not in grouped_by_type:
                 grouped_by_type[vtype] = []
@@ -819,14 +980,14 @@ def _product_to_response(product: Product) -> ProductAdminResponse:
                 # Has categories - build categories list
                 categories = []
                 for group in groups:
-                    variants = [ProductVariantResponse.model_validate(v) for v in sorted(group.variants, key=lambda v: v.display_order)]
-                    categories.append(VariantCategoryResponse(
+                    variants = [_variant_response(v) for v in group.variants]
+                    categories.append(VariantCategoryResponse.model_construct(
                         id=group.id,
                         name=group.name or vtype,  # Use variant_type as fallback name
                         display_order=group.display_order,
                         variants=variants
                     ))
-                variant_types.append(VariantTypeResponse(
+                variant_types.append(VariantTypeResponse.model_construct(
                     type=vtype,
                     categories=categories,
                     variants=None
@@ -834,8 +995,8 @@ def _product_to_response(product: Product) -> ProductAdminResponse:
             else:
                 # Simple variants (single group with name=null)
                 group = groups[0]
-                variants = [ProductVariantResponse.model_validate(v) for v in sorted(group.variants, key=lambda v: v.display_order)]
-                variant_types.append(VariantTypeResponse(
+                variants = [_variant_response(v) for v in group.variants]
+                variant_types.append(VariantTypeResponse.model_construct(
                     type=vtype,
                     categories=None,
                     variants=variants
@@ -843,11 +1004,11 @@ def _product_to_response(product: Product) -> ProductAdminResponse:
     
     # Build categories response
     categories_response = []
-    if product.product_categories:
+    if include_relations and product.product_categories:
         for pc in product.product_categories:
             cat = pc.category
             group = cat.group
-            categories_response.append(CategoryResponse(
+            categories_response.append(CategoryResponse.model_construct(
                 id=cat.id,
                 name=cat.name,
                 name_en=cat.name_en,
@@ -863,7 +1024,8 @@ def _product_to_response(product: Product) -> ProductAdminResponse:
                 group_show_in_filters=group.show_in_filters
             ))
     
-    return ProductAdminResponse(
+    # Everything below comes from our own rows, so skip pydantic validation
+    return ProductAdminResponse.model_construct(
         id=product.id,
         seller_sku=product.seller_sku,
         # Names
@@ -906,19 +1068,61 @@ def _product_to_response(product: Product) -> ProductAdminResponse:
     )
 
 
+def _encode_product_cursor(name: Optional[str], row_id: int) -> str:
+    """Opaque keyset cursor for product listings ordered by (name, id)"""
+    payload = {"name": name, "id": row_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_product_cursor(cursor: str) -> tuple:
+    """Decode a cursor produced by _encode_product_cursor into (name, id); name may be None"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        name = payload["name"]
+        if name is not None and not isinstance(name, str):
+            raise TypeError("name")
+        return name, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Product listings page by (name ASC NULLS LAST, id ASC). Postgres already puts
+# NULLs last ascending; spelling it out gives SQLite (NULLs first) the same order.
+def _product_keyset_after(cursor_name: Optional[str], cursor_id: int):
+    """Filter for the products that follow a (name, id) cursor"""
+    if cursor_name is None:
+        # Only the rest of the NULL block is left
+        return and_(Product.name.is_(None), Product.id > cursor_id)
+    # NULL names sort after every named product (and fail the row comparison)
+    return or_(tuple_(Product.name, Product.id) > tuple_(cursor_name, cursor_id), Product.name.is_(None))
+
+
 def list_products(
     db: Session,
     search: Optional[str] = None,
     brand: Optional[str] = None,
-    is_in_stock: Optional[bool] = None
-) -> List[ProductAdminResponse]:
-    """List all products with optional filters (excludes soft-deleted)"""
+    is_in_stock: Optional[bool] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_variants: bool = True
+) -> tuple[List[ProductAdminResponse], Optional[str]]:
+    """
+    List products with optional filters (excludes soft-deleted).
+    
+    Without limit every match is returned. With limit, products are paged by
+    keyset on (name, id): pass the returned next_cursor back as cursor.
+    include_variants=False skips loading variants/categories (lean listing).
+    Returns (products, next_cursor).
+    """
     query = db.query(Product)
+    if include_variants:
+        query = query.options(*_product_response_options())
     
     # Exclude soft-deleted products
     query = query.filter(Product.active == True)
     
     if search:
+        # Backed by pg_trgm GIN indexes on Postgres (migration a2b3c4d5e6f7)
         search_filter = f"%{search}%"
         query = query.filter(
             (Product.name.ilike(search_filter)) |
@@ -931,13 +1135,26 @@ def list_products(
     if is_in_stock is not None:
         query = query.filter(Product.is_in_stock == is_in_stock)
     
-    products = query.order_by(Product.name).all()
-    return [_product_to_response(p) for p in products]
+    if cursor:
+        cursor_name, cursor_id = _decode_product_cursor(cursor)
+        query = query.filter(_product_keyset_after(cursor_name, cursor_id))
+    
+    query = query.order_by(Product.name.asc().nulls_last(), Product.id)
+    next_cursor = None
+    if limit:
+        products = query.limit(limit + 1).all()
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = _encode_product_cursor(products[-1].name, products[-1].id)
+    else:
+        products = query.all()
+    
+    return [_product_to_response(p, include_variants) for p in products], next_cursor
 
 
 def get_product(product_id: int, db: Session) -> ProductAdminResponse:
     """Get a single product by ID"""
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.query(Product).options(*_product_response_options()).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return _product_to_response(product)
@@ -957,9 +1174,9 @@ def delete_product(product_id: int, db: Session) -> dict:
         raise HTTPException(status_code=400, detail="Product already deleted")
     
     # Check if product is in any order (directly or via variants)
-    has_direct_orders = db.query(OrderItem).filter(
-        OrderItem.product_id == product_id
-    ).first() is not None
+    has_direct_orders = db.query(
+        db.query(OrderItem.id).filter(OrderItem.product_id == product_id).exists()
+    ).scalar()
     
     if has_direct_orders:
         # Soft delete: product is in orders, keep for history
@@ -982,12 +1199,26 @@ def bulk_delete_products(data: ProductBulkDelete, db: Session) -> ProductBulkDel
     Delete multiple products at once.
     - If product is in any order: soft delete (active=False)
     - If product has no orders: hard delete
+    Products and their order usage are loaded up front with one query each; the
+    batch commits once, with a SAVEPOINT per product to isolate failures.
     """
     deleted_count = 0
     errors = []
     
+    ids = set(data.product_ids)
+    products = {
+        p.id: p for p in db.query(Product).options(
+            selectinload(Product.variant_groups).selectinload(ProductVariantGroup.variants),
+            selectinload(Product.product_categories),
+        ).filter(Product.id.in_(ids))
+    } if ids else {}
+    ordered_ids = {
+        pid for (pid,) in db.query(OrderItem.product_id).filter(OrderItem.product_id.in_(ids)).distinct()
+    } if ids else set()
+    removed_ids = set()
+    
     for product_id in data.product_ids:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        product = products.get(product_id)
         if not product:
             errors.append(ProductBulkDeleteError(
                 id=product_id,
@@ -995,7 +1226,7 @@ def bulk_delete_products(data: ProductBulkDelete, db: Session) -> ProductBulkDel
             ))
             continue
         
-        if not product.active:
+        if not product.active or product_id in removed_ids:
             errors.append(ProductBulkDeleteError(
                 id=product_id,
                 error="Product already deleted"
@@ -1003,30 +1234,27 @@ def bulk_delete_products(data: ProductBulkDelete, db: Session) -> ProductBulkDel
             continue
         
         try:
-            # Check if product is in any order
-            has_orders = db.query(OrderItem).filter(
-                OrderItem.product_id == product_id
-            ).first() is not None
-            
-            if has_orders:
-                # Soft delete
-                product.active = False
-                for group in product.variant_groups:
-                    for variant in group.variants:
-                        variant.active = False
-            else:
-                # Hard delete
-                db.delete(product)
-            
-            db.commit()
+            with db.begin_nested():
+                if product_id in ordered_ids:
+                    # Soft delete
+                    product.active = False
+                    for group in product.variant_groups:
+                        for variant in group.variants:
+                            variant.active = False
+                else:
+                    # Hard delete
+                    db.delete(product)
+                    removed_ids.add(product_id)
             deleted_count += 1
         except Exception as e:
-            db.rollback()
+            removed_ids.discard(product_id)
             errors.append(ProductBulkDeleteError(
                 id=product_id,
                 error=str(e)
             ))
     
+    db.commit()
+    
     return ProductBulkDeleteResponse(
         deleted=deleted_count,
         failed=len(errors),
@@ -1034,13 +1262,158 @@ def bulk_delete_products(data: ProductBulkDelete, db: Session) -> ProductBulkDel
     )
 
 
-def bulk_update_products(data: ProductBulkUpdate, db: Session) -> ProductBulkUpdateResponse:
-    """Update multiple products at once (for inventory, prices, variants, categories, etc.)"""
-    updated_products = []
+def _apply_bulk_update_item(product: Product, item: ProductBulkUpdateItem, db: Session) -> list:
+    """Apply one bulk update item to a loaded product (caller owns the transaction).
+    Returns the names of the fields that were updated."""
+    # Extract variant_groups and categories before processing other fields
+    variant_groups_data = item.variant_groups
+    categories_data = item.categories
+    update_data = item.model_dump(exclude={'id', 'variant_groups', 'categories'}, exclude_unset=True)
+    updated_fields = []
+    
+    # Update simple fields
+    for field, value in update_data.items():
+        if value is not None:
+            setattr(product, field, value)
+            updated_fields.append(field)
+    
+    # Handle variant_groups if provided
+    if variant_groups_data is not None:
+        if variant_groups_data:
+            product.has_variants = True
+            
+            # Build map of existing variants by SKU and name for matching
+            existing_variants_map = {}
+            for group in product.variant_groups:
+                for variant in group.variants:
+                    if variant.seller_sku:
+                        existing_variants_map[f"sku:{variant.seller_sku}"] = variant
+                    existing_variants_map[f"name:{variant.name}"] = variant
+            
+            # Soft-delete all existing variants first
+            for group in product.variant_groups:
+                for variant in group.variants:
+                    variant.active = False
+                    variant.updated_at = datetime.utcnow()
+            
+            # Track which existing groups we've used
+            used_group_ids = set()
+            
+            for group_data in variant_groups_data:
+                variants_data = group_data.variants
+                
+                # Try to find existing group with same variant_type AND name
+                existing_group = None
+                for g in product.variant_groups:
+                    if g.id in used_group_ids:
+                        continue
+                    if g.variant_type == group_data.variant_type:
+                        if group_data.name and g.name == group_data.name:
+                            existing_group = g
+                            break
+                        elif not group_data.name and not g.name:
+                            existing_group = g
+                            break
+                
+                if existing_group:
+                    existing_group.name = group_data.name
+                    existing_group.display_order = group_data.display_order
+                    used_group_ids.add(existing_group.id)
+                    group = existing_group
+                else:
+                    group = ProductVariantGroup(
+                        product_id=product.id,
+                        variant_type=group_data.variant_type,
+                        name=group_data.name,
+                        display_order=group_data.display_order
+                    )
+                    db.add(group)
+                    db.flush()
+                
+                # Process variants - match existing ones to preserve stock
+                for idx, variant_data in enumerate(variants_data):
+                    variant_dict = variant_data.model_dump(exclude_unset=True)
+                    if not variant_dict.get('variant_value') and variant_dict.get('name'):
+                        variant_dict['variant_value'] = variant_dict['name']
+                    
+                    # Use array index as display_order if not explicitly set
+                    if 'display_order' not in variant_dict or variant_dict.get('display_order', 0) == 0:
+                        variant_dict['display_order'] = idx
+                    
+                    # Try to find existing variant by SKU or name
+                    existing_variant = None
+                    if variant_dict.get('seller_sku'):
+                        existing_variant = existing_variants_map.get(f"sku:{variant_dict['seller_sku']}")
+                    if not existing_variant and variant_dict.get('name'):
+                        existing_variant = existing_variants_map.get(f"name:{variant_dict['name']}")
+                    
+                    if existing_variant:
+                        # Reactivate and update existing variant (preserves stock if not provided)
+                        existing_variant.active = True
+                        existing_variant.group_id = group.id
+                        for key, value in variant_dict.items():
+                            if value is not None:
+                                setattr(existing_variant, key, value)
+                        existing_variant.updated_at = datetime.utcnow()
+                    else:
+                        # Create new variant
+                        variant = ProductVariant(
+                            group_id=group.id,
+                            **variant_dict
+                        )
+                        db.add(variant)
+        else:
+            # Empty array = soft-delete all variants
+            for group in product.variant_groups:
+                for variant in group.variants:
+                    variant.active = False
+                    variant.updated_at = datetime.utcnow()
+            product.has_variants = False
+    
+    # Handle categories if provided (replace all)
+    if categories_data is not None:
+        # Delete existing product-category links
+        db.query(ProductCategory).filter(ProductCategory.product_id == product.id).delete()
+        db.flush()
+        
+        # Process new categories
+        if categories_data:
+            _process_categories(product.id, categories_data, db)
+    
+    # Force updated_at to update
+    product.updated_at = datetime.utcnow()
+    
+    if variant_groups_data is not None:
+        updated_fields.append('variant_groups')
+    if categories_data is not None:
+        updated_fields.append('categories')
+    return updated_fields
+
+
+def bulk_update_products(
+    data: ProductBulkUpdate,
+    db: Session,
+    include_products: bool = True
+) -> ProductBulkUpdateResponse:
+    """
+    Update multiple products at once (for inventory, prices, variants, categories, etc.)
+    Target products are loaded with one query up front; the batch commits once,
+    with a SAVEPOINT per product so a failing item is rolled back on its own.
+    include_products=False skips re-reading and serializing the full products;
+    the lean per-item results are always returned.
+    """
+    items = []
     errors = []
     
+    ids = {item.id for item in data.products}
+    products = {
+        p.id: p for p in db.query(Product).options(
+            selectinload(Product.variant_groups).selectinload(ProductVariantGroup.variants),
+        ).filter(Product.id.in_(ids))
+    } if ids else {}
+    
     for item in data.products:
-        product = db.query(Product).filter(Product.id == item.id).first()
+        product = products.get(item.id)
         if not product:
             errors.append(ProductBulkUpdateError(
                 id=item.id,
@@ -1050,146 +1423,68 @@ def bulk_update_products(data: ProductBulkUpdate, db: Session) -> ProductBulkUpd
             continue
         
         try:
-            # Extract variant_groups and categories before processing other fields
-            variant_groups_data = item.variant_groups
-            categories_data = item.categories
-            update_data = item.model_dump(exclude={'id', 'variant_groups', 'categories'}, exclude_unset=True)
-            
-            # Update simple fields
-            for field, value in update_data.items():
-                if value is not None:
-                    setattr(product, field, value)
-            
-            # Handle variant_groups if provided
-            if variant_groups_data is not None:
-                if variant_groups_data:
-                    product.has_variants = True
-                    
-                    # Build map of existing variants by SKU and name for matching
-                    existing_variants_map = {}
-                    for group in product.variant_groups:
-                        for variant in group.variants:
-                            if variant.seller_sku:
-                                existing_variants_map[f"sku:{variant.seller_sku}"] = variant
-                            existing_variants_map[f"name:{variant.name}"] = variant
-                    
-                    # Soft-delete all existing variants first
-                    for group in product.variant_groups:
-                        for variant in group.variants:
-                            variant.active = False
-                            variant.updated_at = datetime.utcnow()
-                    
-                    # Track which existing groups we've used
-                    used_group_ids = set()
-                    
-                    for group_data in variant_groups_data:
-                        variants_data = group_data.variants
-                        
-                        # Try to find existing group with same variant_type AND name
-                        existing_group = None
-                        for g in product.variant_groups:
-                            if g.id in used_group_ids:
-                                continue
-                            if g.variant_type == group_data.variant_type:
-                                if group_data.name and g.name == group_data.name:
-                                    existing_group = g
-                                    break
-                                elif not group_data.name and not g.name:
-                                    existing_group = g
-                                    break
-                        
-                        if existing_group:
-                            existing_group.name = group_data.name
-                            existing_group.display_order = group_data.display_order
-                            used_group_ids.add(existing_group.id)
-                            group = existing_group
-                        else:
-                            group = ProductVariantGroup(
-                                product_id=product.id,
-                                variant_type=group_data.variant_type,
-                                name=group_data.name,
-                                display_order=group_data.display_order
-                            )
-                            db.add(group)
-                            db.flush()
-                        
-                        # Process variants - match existing ones to preserve stock
-                        for idx, variant_data in enumerate(variants_data):
-                            variant_dict = variant_data.model_dump(exclude_unset=True)
-                            if not variant_dict.get('variant_value') and variant_dict.get('name'):
-                                variant_dict['variant_value'] = variant_dict['name']
-                            
-                            # Use array index as display_order if not explicitly set
-                            if 'display_order' not in variant_dict or variant_dict.get('display_order', 0) == 0:
-                                variant_dict['display_order'] = idx
-                            
-                            # Try to find existing variant by SKU or name
-                            existing_variant = None
-                            if variant_dict.get('seller_sku'):
-                                existing_variant = existing_variants_map.get(f"sku:{variant_dict['seller_sku']}")
-                            if not existing_variant and variant_dict.get('name'):
-                                existing_variant = existing_variants_map.get(f"name:{variant_dict['name']}")
-                            
-                            if existing_variant:
-                                # Reactivate and update existing variant (preserves stock if not provided)
-                                existing_variant.active = True
-                                existing_variant.group_id = group.id
-                                for key, value in variant_dict.items():
-                                    if value is not None:
-                                        setattr(existing_variant, key, value)
-                                existing_variant.updated_at = datetime.utcnow()
-                            else:
-                                # Create new variant
-                                variant = ProductVariant(
-                                    group_id=group.id,
-                                    **variant_dict
-                                )
-                                db.add(variant)
-                else:
-                    # Empty array = soft-delete all variants
-                    for group in product.variant_groups:
-                        for variant in group.variants:
-                            variant.active = False
-                            variant.updated_at = datetime.utcnow()
-                    product.has_variants = False
-            
-            # Handle categories if provided (replace all)
-            if categories_data is not None:
-                # Delete existing product-category links
-                db.query(ProductCategory).filter(ProductCategory.product_id == product.id).delete()
-                db.flush()
-                
-                # Process new categories
-                if categories_data:
-                    _process_categories(product.id, categories_data, db)
-            
-            # Force updated_at to update
-            product.updated_at = datetime.utcnow()
-            
-            db.commit()
-            db.refresh(product)
-            updated_products.append(_product_to_response(product))
+            with db.begin_nested():
+                updated_fields = _apply_bulk_update_item(product, item, db)
+            items.append(ProductBulkUpdateItemResponse(
+                id=product.id,
+                seller_sku=product.seller_sku,
+                updated_fields=updated_fields
+            ))
+        except IntegrityError as e:
+            errors.append(ProductBulkUpdateError(
+                id=item.id,
+                seller_sku=item.seller_sku,
+                error="SKU already exists" if _is_unique_violation(e) else str(e.orig)
+            ))
         except Exception as e:
-            db.rollback()
-            error_msg = str(e)
-            if "UNIQUE constraint" in error_msg:
-                error_msg = "SKU already exists"
             errors.append(ProductBulkUpdateError(
                 id=item.id,
                 seller_sku=item.seller_sku,
-                error=error_msg
+                error=str(e)
             ))
     
+    db.commit()
+    
+    updated_products = []
+    if include_products and items:
+        # Re-read the updated products (with relations) in one round of SELECTs
+        refreshed = {
+            p.id: p for p in db.query(Product).options(*_product_response_options())
+            .filter(Product.id.in_({i.id for i in items}))
+        }
+        updated_products = [_product_to_response(refreshed[i.id]) for i in items]
+    
     return ProductBulkUpdateResponse(
-        updated=len(updated_products),
+        updated=len(items),
         failed=len(errors),
         errors=errors,
+        items=items,
         products=updated_products
     )
 
 
 # ---------- Variant Management ----------
 
+def _variant_response(variant: ProductVariant) -> ProductVariantResponse:
+    """Build a ProductVariantResponse from a loaded variant without re-validating it"""
+    return ProductVariantResponse.model_construct(
+        **{field: getattr(variant, field) for field in ProductVariantResponse.model_fields}
+    )
+
+
+def _touch_product(product_id, db: Session, **values) -> None:
+    """
+    Bump products.updated_at (plus any extra values) with a single UPDATE.
+    product_id may be a plain id or a scalar subquery resolving to one.
+    """
+    db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(updated_at=utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def add_variant_group(product_id: int, data: ProductVariantGroupCreate, db: Session) -> ProductVariantGroupResponse:
     """Add a variant group with variants to an existing product"""
     product = db.query(Product).filter(Product.id == product_id).first()
@@ -1206,27 +1501,25 @@ def add_variant_group(product_id: int, data: ProductVariantGroupCreate, db: Sess
     db.add(group)
     db.flush()
     
-    # Create variants
+    # Create variants (single multi-row INSERT instead of one per variant)
+    variant_rows = []
     for variant_data in data.variants:
         variant_dict = variant_data.model_dump()
         # Default variant_value to name if not provided
         if not variant_dict.get('variant_value'):
             variant_dict['variant_value'] = variant_dict['name']
-        variant = ProductVariant(
-            group_id=group.id,
-            **variant_dict
-        )
-        db.add(variant)
+        variant_rows.append({"group_id": group.id, **variant_dict})
+    # RETURNING hands back the inserted variants, no refresh needed afterwards
+    variants = []
+    if variant_rows:
+        inserted = db.scalars(insert(ProductVariant).returning(ProductVariant), variant_rows).all()
+        variants = [_variant_response(v) for v in inserted]
     
     # Update product
     product.has_variants = True
-    product.updated_at = datetime.utcnow()
+    product.updated_at = utcnow()
     
-    db.commit()
-    db.refresh(group)
-    
-    variants = [ProductVariantResponse.model_validate(v) for v in group.variants]
-    return ProductVariantGroupResponse(
+    response = ProductVariantGroupResponse(
         id=group.id,
         product_id=group.product_id,
         variant_type=group.variant_type,  # REQUIRED
@@ -1234,6 +1527,8 @@ def add_variant_group(product_id: int, data: ProductVariantGroupCreate, db: Sess
         display_order=group.display_order,
         variants=variants
     )
+    db.commit()
+    return response
 
 
 def add_variant_to_group(group_id: int, data: ProductVariantCreate, db: Session) -> ProductVariantResponse:
@@ -1254,14 +1549,13 @@ def add_variant_to_group(group_id: int, data: ProductVariantCreate, db: Session)
     db.add(variant)
     
     # Update product timestamp
-    product = db.query(Product).filter(Product.id == group.product_id).first()
-    if product:
-        product.updated_at = datetime.utcnow()
+    _touch_product(group.product_id, db)
     
+    # Flush assigns the id and defaults; build the response before commit expires them
+    db.flush()
+    response = _variant_response(variant)
     db.commit()
-    db.refresh(variant)
-    
-    return ProductVariantResponse.model_validate(variant)
+    return response
 
 
 def update_variant(variant_id: int, data: ProductVariantUpdate, db: Session) -> ProductVariantResponse:
@@ -1275,17 +1569,18 @@ def update_variant(variant_id: int, data: ProductVariantUpdate, db: Session) ->
         if value is not None:
             setattr(variant, field, value)
     
-    # Update product timestamp
-    group = db.query(ProductVariantGroup).filter(ProductVariantGroup.id == variant.group_id).first()
-    if group:
-        product = db.query(Product).filter(Product.id == group.product_id).first()
-        if product:
-            product.updated_at = datetime.utcnow()
+    # Update product timestamp (product resolved in SQL, no group/product SELECTs)
+    _touch_product(
+        select(ProductVariantGroup.product_id)
+        .where(ProductVariantGroup.id == variant.group_id)
+        .scalar_subquery(),
+        db
+    )
     
+    # Every field is already known locally; skip the refresh SELECT
+    response = _variant_response(variant)
     db.commit()
-    db.refresh(variant)
-    
-    return ProductVariantResponse.model_validate(variant)
+    return response
 
 
 def delete_variant(variant_id: int, db: Session) -> dict:
@@ -1298,19 +1593,21 @@ def delete_variant(variant_id: int, db: Session) -> dict:
     group_id = variant.group_id
     
     db.delete(variant)
+    db.flush()
     
-    # Update product timestamp
-    group = db.query(ProductVariantGroup).filter(ProductVariantGroup.id == group_id).first()
-    if group:
-        product = db.query(Product).filter(Product.id == group.product_id).first()
-        if product:
-            product.updated_at = datetime.utcnow()
-            # Check if product still has variants
-            remaining_variants = db.query(ProductVariant).join(ProductVariantGroup).filter(
-                ProductVariantGroup.product_id == product.id
-            ).count()
-            if remaining_variants == 0:
-                product.has_variants = False
+    # Update product timestamp and clear has_variants if no variants remain, in one UPDATE
+    group_product_id = (
+        select(ProductVariantGroup.product_id)
+        .where(ProductVariantGroup.id == group_id)
+        .scalar_subquery()
+    )
+    remaining_variants = (
+        select(ProductVariant.id)
+        .join(ProductVariantGroup, ProductVariant.group_id == ProductVariantGroup.id)
+        .where(ProductVariantGroup.product_id == Product.id)
+        .exists()
+    )
+    _touch_product(group_product_id, db, has_variants=case((remaining_variants, Product.has_variants), else_=False))
     
     db.commit()
     return {"msg": f"Variant '{variant_name}' deleted successfully"}
@@ -1326,17 +1623,15 @@ def delete_variant_group(group_id: int, db: Session) -> dict:
     product_id = group.product_id
     
     db.delete(group)  # Cascade deletes variants
+    db.flush()
     
-    # Update product
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if product:
-        product.updated_at = datetime.utcnow()
-        # Check if product still has variant groups
-        remaining_groups = db.query(ProductVariantGroup).filter(
-            ProductVariantGroup.product_id == product.id
-        ).count()
-        if remaining_groups == 0:
-            product.has_variants = False
+    # Update product timestamp and clear has_variants if no groups remain, in one UPDATE
+    remaining_groups = (
+        select(ProductVariantGroup.id)
+        .where(ProductVariantGroup.product_id == Product.id)
+        .exists()
+    )
+    _touch_product(product_id, db, has_variants=case((remaining_groups, Product.has_variants), else_=False))
     
     db.commit()
     return {"msg": f"Variant group '{group_name}' deleted successfully"}
@@ -1375,7 +1670,9 @@ def bulk_delete_variants(data: VariantBulkDelete, db: Session) -> VariantBulkDel
                 affected_products.add(group.product_id)
             
             # Check if variant is referenced in any order
-            has_orders = db.query(OrderItem).filter(OrderItem.variant_id == variant_id).first() is not None
+            has_orders = db.query(
+                db.query(OrderItem.id).filter(OrderItem.variant_id == variant_id).exists()
+            ).scalar()
             
             if has_orders:
                 # Soft delete: variant is in orders, keep for history
@@ -1393,20 +1690,30 @@ def bulk_delete_variants(data: VariantBulkDelete, db: Session) -> VariantBulkDel
                 error=str(e)
             ))
     
-    # Update affected products
-    for product_id in affected_products:
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if product:
-            product.updated_at = datetime.utcnow()
-            # Check if product still has ACTIVE variants
-            remaining_active_variants = db.query(ProductVariant).join(ProductVariantGroup).filter(
-                ProductVariantGroup.product_id == product.id,
+    # Update affected products: one aggregate over their remaining ACTIVE variants
+    # instead of a count + stock recalculation per product
+    if affected_products:
+        remaining = {
+            row.product_id: row
+            for row in db.query(
+                ProductVariantGroup.product_id,
+                func.count(ProductVariant.id).label("active_variants"),
+                func.coalesce(func.sum(ProductVariant.stock), 0).label("total_stock"),
+                func.max(case((ProductVariant.is_in_stock == True, 1), else_=0)).label("any_in_stock"),
+            ).join(ProductVariant, ProductVariant.group_id == ProductVariantGroup.id).filter(
+                ProductVariantGroup.product_id.in_(affected_products),
                 ProductVariant.active == True
-            ).count()
-            if remaining_active_variants == 0:
+            ).group_by(ProductVariantGroup.product_id).all()
+        }
+        for product in db.query(Product).filter(Product.id.in_(affected_products)).all():
+            product.updated_at = utcnow()
+            stats = remaining.get(product.id)
+            if stats is None:
                 product.has_variants = False
-            # Recalculate stock based on active variants only
-            _recalculate_product_stock(product, db)
+            if product.has_variants:
+                # Same rule as _recalculate_product_stock, from the aggregate
+                product.stock = int(stats.total_stock)
+                product.is_in_stock = bool(stats.any_in_stock)
     
     db.commit()
     
@@ -1419,6 +1726,10 @@ def bulk_delete_variants(data: VariantBulkDelete, db: Session) -> VariantBulkDel
 
 # ---------- Order Management ----------
 
+# The only User columns _transform_address_to_tiktok_format reads
+_ADDRESS_USER_COLUMNS = (User.id, User.first_name, User.last_name, User.phone, User.whatsapp_phone)
+
+
 def _transform_address_to_tiktok_format(address_dict: Optional[dict], user: Optional[User] = None) -> Optional[RecipientAddress]:
     """Transform address dict to TikTok-style format"""
     if not address_dict:
@@ -1524,16 +1835,159 @@ def _transform_address_to_tiktok_format(address_dict: Optional[dict], user: Opti
     )
 
 
+def _paginate(query, page: int, page_size: int, include_total: bool):
+    """
+    Fetch one page of an already filtered/ordered query.
+    
+    The total comes from COUNT(*) OVER () on the page query itself, so rows and
+    total share a single scan. With include_total=False no count is computed: we
+    fetch page_size + 1 rows and use the extra one to tell whether a next page exists.
+    Returns (rows, total_items, total_pages, has_next); totals are None when skipped.
+    """
+    offset = (page - 1) * page_size
+    if include_total:
+        counted = query.add_columns(func.count().over().label("total_items")).offset(offset).limit(page_size).all()
+        # Entity queries get (entity, total) rows; column queries keep the whole row
+        rows = [row[0] for row in counted] if len(query.column_descriptions) == 1 else counted
+        if counted:
+            total_items = counted[0].total_items
+        else:
+            # Past the last page there is no row to carry the window count
+            total_items = query.count() if offset else 0
+        total_pages = (total_items + page_size - 1) // page_size
+        return rows, total_items, total_pages, page < total_pages
+    
+    rows = query.offset(offset).limit(page_size + 1).all()
+    has_next = len(rows) > page_size
+    return rows[:page_size], None, None, has_next
+
+
+def _encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Opaque keyset cursor for listings ordered by (created_at DESC, id DESC)"""
+    payload = {"created_at": created_at.isoformat() if created_at else None, "id": row_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor produced by _encode_cursor into (created_at, id); created_at may be None"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = payload["created_at"]
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        return created_at, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# created_at is nullable, so keyset listings spell out where NULLs go:
+# (created_at DESC NULLS FIRST, id DESC). That is what a backward scan of the
+# (created_at, id) indexes yields on Postgres, and gives SQLite (where NULLs
+# sort low) the same order.
+def _created_at_keyset_order(created_col, id_col) -> tuple:
+    return created_col.desc().nulls_first(), id_col.desc()
+
+
+def _created_at_keyset_after(created_col, id_col, cursor_created_at: Optional[datetime], cursor_id: int):
+    """Filter for the rows that follow a (created_at, id) cursor in _created_at_keyset_order"""
+    if cursor_created_at is None:
+        # Rest of the NULL block, then every dated row
+        return or_(and_(created_col.is_(None), id_col < cursor_id), created_col.isnot(None))
+    # NULL rows sort first, so they all precede a dated cursor (and fail the comparison)
+    return tuple_(created_col, id_col) < tuple_(cursor_created_at, cursor_id)
+
+
+# Order columns an OrderAdminResponse is built from. Read-only listings select
+# these as plain rows instead of hydrating Order instances.
+_ORDER_RESPONSE_COLUMNS = (
+    Order.id, Order.session_id, Order.user_id, Order.shipping_method, Order.payment_method,
+    Order.address, Order.status, Order.payment_status, Order.subtotal, Order.tax,
+    Order.shipping_fee, Order.total, Order.created_at, Order.paid_at,
+    Order.stripe_payment_intent_id, Order.combined, Order.combined_group_id,
+)
+
+
+def _order_items_by_order(order_ids, db: Session) -> dict:
+    """
+    Item rows for a set of orders in one SELECT, with the variant and product
+    name/SKU/image joined in. Returns {order_id: [OrderItemResponse, ...]}.
+    """
+    items = {order_id: [] for order_id in order_ids}
+    if not items:
+        return items
+    rows = db.execute(
+        select(
+            OrderItem.order_id, OrderItem.id, OrderItem.product_id, OrderItem.variant_id,
+            OrderItem.variant_name, OrderItem.quantity, OrderItem.price,
+            ProductVariant.name.label("v_name"),
+            ProductVariant.seller_sku.label("v_sku"),
+            ProductVariant.image_url.label("v_image"),
+            Product.id.label("p_id"),
+            Product.name.label("p_name"),
+            Product.seller_sku.label("p_sku"),
+            Product.image_url.label("p_image"),
+        )
+        .outerjoin(ProductVariant, ProductVariant.id == OrderItem.variant_id)
+        .outerjoin(Product, Product.id == OrderItem.product_id)
+        .where(OrderItem.order_id.in_(list(items)))
+        .order_by(OrderItem.id)
+    ).all()
+    for row in rows:
+        # Values come straight from the DB, so skip pydantic validation
+        items[row.order_id].append(OrderItemResponse.model_construct(
+            id=row.id,
+            product_id=row.product_id,
+            variant_id=row.variant_id,
+            product_name=row.p_name if row.p_id is not None else "Unknown",
+            variant_name=row.variant_name or row.v_name,
+            # Use variant SKU/image if exists, otherwise the product's
+            seller_sku=row.v_sku or row.p_sku,
+            quantity=row.quantity,
+            price=row.price,
+            image_url=row.v_image or row.p_image
+        ))
+    return items
+
+
+def _shipments_by_order(order_ids, db: Session) -> dict:
+    """Shipments for a set of orders in one SELECT: {order_id: [OrderShipmentResponse, ...]}"""
+    shipments = {order_id: [] for order_id in order_ids}
+    if not shipments:
+        return shipments
+    rows = db.execute(
+        select(
+            OrderShipment.id, OrderShipment.order_id, OrderShipment.tracking_number,
+            OrderShipment.tracking_url, OrderShipment.carrier, OrderShipment.shipped_at,
+            OrderShipment.estimated_delivery, OrderShipment.delivered_at, OrderShipment.notes,
+            OrderShipment.created_at, OrderShipment.updated_at,
+        )
+        .where(OrderShipment.order_id.in_(list(shipments)))
+        .order_by(OrderShipment.created_at)
+    ).all()
+    for row in rows:
+        shipments[row.order_id].append(_shipment_response(row))
+    return shipments
+
+
 def list_orders(
     db: Session,
     status: Optional[str] = None,
     payment_status: Optional[str] = None,
     user_id: Optional[int] = None,
     page: int = 1,
-    page_size: int = 20
+    page_size: int = 20,
+    include_total: bool = True,
+    cursor: Optional[str] = None
 ) -> PaginatedOrdersResponse:
-    """List orders with filters and pagination"""
-    query = db.query(Order)
+    """
+    List orders with filters and pagination.
+    
+    Pass the previous response's next_cursor as cursor to page by keyset
+    (created_at, id) instead of OFFSET; page is ignored and no total is computed.
+    """
+    # Orders, items (with variant/product joined), shipments and users are
+    # read as plain rows, one SELECT each per page; no ORM objects are built
+    query = db.query(*_ORDER_RESPONSE_COLUMNS)
     
     if status:
         query = query.filter(Order.status == status)
@@ -1542,133 +1996,104 @@ def list_orders(
     if user_id:
         query = query.filter(Order.user_id == user_id)
     
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.filter(_created_at_keyset_after(Order.created_at, Order.id, cursor_created_at, cursor_id))
+        page, include_total = 1, False
     
-    orders = query.order_by(Order.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
+    orders, total_items, total_pages, has_next = _paginate(
+        query.order_by(*_created_at_keyset_order(Order.created_at, Order.id)), page, page_size, include_total
+    )
     
-    results = []
-    for order in orders:
-        items = []
-        for item in order.items:
-            product = item.product
-            variant = item.variant
-            
-            product_name = product.name if product else "Unknown"
-            variant_name = item.variant_name or (variant.name if variant else None)
-            
-            # Use variant SKU if exists, otherwise product SKU
-            seller_sku = None
-            if variant and variant.seller_sku:
-                seller_sku = variant.seller_sku
-            elif product and product.seller_sku:
-                seller_sku = product.seller_sku
-            
-            # Use variant image if available, otherwise product image
-            image_url = None
-            if variant and variant.image_url:
-                image_url = variant.image_url
-            elif product:
-                image_url = product.image_url
-            
-            items.append(OrderItemResponse(
-                id=item.id,
-                product_id=item.product_id,
-                variant_id=item.variant_id,
-                product_name=product_name,
-                variant_name=variant_name,
-                seller_sku=seller_sku,
-                quantity=item.quantity,
-                price=item.price,
-                image_url=image_url
-            ))
-        
-        # Transform address to TikTok format
-        user = db.query(User).filter(User.id == order.user_id).first() if order.user_id else None
-        recipient_address = _transform_address_to_tiktok_format(order.address, user)
-        
-        # Build shipments list
-        shipments = [
-            OrderShipmentResponse(
-                id=shipment.id,
-                order_id=shipment.order_id,
-                tracking_number=shipment.tracking_number,
-                tracking_url=shipment.tracking_url,
-                carrier=shipment.carrier,
-                shipped_at=shipment.shipped_at,
-                estimated_delivery=shipment.estimated_delivery,
-                delivered_at=shipment.delivered_at,
-                notes=shipment.notes,
-                created_at=shipment.created_at,
-                updated_at=shipment.updated_at
-            )
-            for shipment in sorted(order.shipments, key=lambda s: s.created_at)
-        ]
-        
-        results.append(OrderAdminResponse(
-            id=order.id,
-            session_id=order.session_id,
-            user_id=order.user_id,
-            shipping_method=order.shipping_method,
-            payment_method=order.payment_method,
-            address=recipient_address,
-            status=order.status,
-            payment_status=order.payment_status,
-            subtotal=order.subtotal,
-            tax=order.tax,
-            shipping_fee=order.shipping_fee,
-            total=order.total,
-            created_at=order.created_at,
-            paid_at=order.paid_at,
-            stripe_payment_intent_id=order.stripe_payment_intent_id,
-            shipments=shipments,
-            items=items
-        ))
+    order_ids = [order.id for order in orders]
+    items = _order_items_by_order(order_ids, db)
+    shipments = _shipments_by_order(order_ids, db)
+    user_ids = {order.user_id for order in orders if order.user_id}
+    users = {
+        row.id: row for row in db.execute(
+            select(*_ADDRESS_USER_COLUMNS).where(User.id.in_(user_ids))
+        )
+    } if user_ids else {}
+    
+    results = [
+        _order_to_response(
+            order,
+            items=items[order.id],
+            # Transform address to TikTok format
+            address=_transform_address_to_tiktok_format(order.address, users.get(order.user_id)),
+            shipments=shipments[order.id],
+        )
+        for order in orders
+    ]
     
     return PaginatedOrdersResponse(
         page=page,
         page_size=page_size,
         total_items=total_items,
         total_pages=total_pages,
+        has_next=has_next,
+        next_cursor=_encode_cursor(orders[-1].created_at, orders[-1].id) if has_next else None,
         results=results
     )
 
 
+def _shipment_response(shipment: OrderShipment, shared_with: Optional[List[int]] = None) -> OrderShipmentResponse:
+    return OrderShipmentResponse.model_construct(
+        id=shipment.id,
+        order_id=shipment.order_id,
+        tracking_number=shipment.tracking_number,
+        tracking_url=shipment.tracking_url,
+        carrier=shipment.carrier,
+        shipped_at=shipment.shipped_at,
+        estimated_delivery=shipment.estimated_delivery,
+        delivered_at=shipment.delivered_at,
+        notes=shipment.notes,
+        created_at=shipment.created_at,
+        updated_at=shipment.updated_at,
+        shared_with_orders=shared_with
+    )
+
+
+def _order_to_response(
+    order,
+    items: List[OrderItemResponse],
+    address: Optional[RecipientAddress],
+    shipments: List[OrderShipmentResponse],
+    combined_with: Optional[List[int]] = None
+) -> OrderAdminResponse:
+    """
+    Assemble an OrderAdminResponse (unvalidated) from an order and its prebuilt
+    parts. `order` is an Order or a row of _ORDER_RESPONSE_COLUMNS.
+    """
+    return OrderAdminResponse.model_construct(
+        id=order.id,
+        session_id=order.session_id,
+        user_id=order.user_id,
+        shipping_method=order.shipping_method,
+        payment_method=order.payment_method,
+        address=address,
+        status=order.status,
+        payment_status=order.payment_status,
+        subtotal=order.subtotal,
+        tax=order.tax,
+        shipping_fee=order.shipping_fee,
+        total=order.total,
+        created_at=order.created_at,
+        paid_at=order.paid_at,
+        stripe_payment_intent_id=order.stripe_payment_intent_id,
+        combined=order.combined or False,
+        combined_group_id=order.combined_group_id,
+        combined_with=combined_with,
+        shipments=shipments,
+        items=items
+    )
+
+
 def _order_to_admin_response(order: Order, db: Session) -> OrderAdminResponse:
     """Helper function to convert Order to OrderAdminResponse"""
-    items = []
-    for item in order.items:
-        product = item.product
-        variant = item.variant
-        
-        product_name = product.name if product else "Unknown"
-        variant_name = item.variant_name or (variant.name if variant else None)
-        
-        seller_sku = None
-        if variant and variant.seller_sku:
-            seller_sku = variant.seller_sku
-        elif product and product.seller_sku:
-            seller_sku = product.seller_sku
-        
-        image_url = None
-        if variant and variant.image_url:
-            image_url = variant.image_url
-        elif product:
-            image_url = product.image_url
-        
-        items.append(OrderItemResponse(
-            id=item.id,
-            product_id=item.product_id,
-            variant_id=item.variant_id,
-            product_name=product_name,
-            variant_name=variant_name,
-            seller_sku=seller_sku,
-            quantity=item.quantity,
-            price=item.price,
-            image_url=image_url
-        ))
-    
-    user = db.query(User).filter(User.id == order.user_id).first() if order.user_id else None
+    user = db.execute(
+        select(*_ADDRESS_USER_COLUMNS).where(User.id == order.user_id)
+    ).first() if order.user_id else None
     recipient_address = _transform_address_to_tiktok_format(order.address, user)
     
     shipments = []
@@ -1679,21 +2104,7 @@ def _order_to_admin_response(order: Order, db: Session) -> OrderAdminResponse:
                 CombinedOrder.combined_group_id == shipment.combined_group_id
             ).all()
             shared_with = [co.order_id for co in combined_orders_for_shipment]
-        
-        shipments.append(OrderShipmentResponse(
-            id=shipment.id,
-            order_id=shipment.order_id,
-            tracking_number=shipment.tracking_number,
-            tracking_url=shipment.tracking_url,
-            carrier=shipment.carrier,
-            shipped_at=shipment.shipped_at,
-            estimated_delivery=shipment.estimated_delivery,
-            delivered_at=shipment.delivered_at,
-            notes=shipment.notes,
-            created_at=shipment.created_at,
-            updated_at=shipment.updated_at,
-            shared_with_orders=shared_with
-        ))
+        shipments.append(_shipment_response(shipment, shared_with))
     
     combined_with = None
     if order.combined_group_id:
@@ -1702,33 +2113,18 @@ def _order_to_admin_response(order: Order, db: Session) -> OrderAdminResponse:
         ).all()
         combined_with = [co.order_id for co in combined_orders if co.order_id != order.id]
     
-    return OrderAdminResponse(
-        id=order.id,
-        session_id=order.session_id,
-        user_id=order.user_id,
-        shipping_method=order.shipping_method,
-        payment_method=order.payment_method,
+    return _order_to_response(
+        order,
+        items=_order_items_by_order([order.id], db)[order.id],
         address=recipient_address,
-        status=order.status,
-        payment_status=order.payment_status,
-        subtotal=order.subtotal,
-        tax=order.tax,
-        shipping_fee=order.shipping_fee,
-        total=order.total,
-        created_at=order.created_at,
-        paid_at=order.paid_at,
-        stripe_payment_intent_id=order.stripe_payment_intent_id,
-        combined=order.combined or False,
-        combined_group_id=order.combined_group_id,
-        combined_with=combined_with,
         shipments=shipments,
-        items=items
+        combined_with=combined_with
     )
 
 
 def get_order(order_id: int, db: Session) -> OrderAdminResponse:
     """Get a single order by ID"""
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).options(selectinload(Order.shipments)).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -1736,45 +2132,47 @@ def get_order(order_id: int, db: Session) -> OrderAdminResponse:
 
 
 def update_order_status(order_id: int, data: OrderStatusUpdate, db: Session) -> OrderAdminResponse:
-    """Update order status"""
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    
-    valid_statuses = [
-        "pending", "pending_payment", "processing_payment", "pending_verification", "awaiting_verification",
-        "paid", "payment_failed", "processing", "shipped", "delivered", "canceled", "refunded"
-    ]
-    if data.status not in valid_statuses:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid status. Valid values: {valid_statuses}"
-        )
-    
-    old_status = order.status
-    order.status = data.status
+    """Update order status (data.status is already validated by the OrderStatusUpdate schema)"""
+    values = {"status": data.status}
     
     # If marking as paid, update payment_status and paid_at
     if data.status == "paid":
-        order.payment_status = "completed"
-        if not order.paid_at:
-            order.paid_at = datetime.utcnow()
+        values["payment_status"] = "completed"
+        values["paid_at"] = func.coalesce(Order.paid_at, utcnow())
+    
+    # If marking as payment_failed, update payment_status (stock restored below)
+    if data.status == "payment_failed":
+        values["payment_status"] = "failed"
+    
+    # UPDATE ... RETURNING hands back the updated order in the same round trip
+    order = db.scalars(
+        update(Order).where(Order.id == order_id).values(**values).returning(Order)
+    ).one_or_none()
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
     
-    # If marking as payment_failed, restore stock and update payment_status
     if data.status == "payment_failed":
-        order.payment_status = "failed"
         # Restore stock that was deducted when order was created
         try:
-            from models import OrderItem, Product, ProductVariant
+            # Load every referenced variant/product with one IN query each, not one per item
+            variant_ids = {i.variant_id for i in order.items if i.variant_id}
+            product_ids = {i.product_id for i in order.items if not i.variant_id}
+            variants = {
+                v.id: v for v in db.query(ProductVariant).filter(ProductVariant.id.in_(variant_ids))
+            } if variant_ids else {}
+            products = {
+                p.id: p for p in db.query(Product).filter(Product.id.in_(product_ids))
+            } if product_ids else {}
+            
             for order_item in order.items:
                 if order_item.variant_id:
-                    variant = db.query(ProductVariant).filter(ProductVariant.id == order_item.variant_id).first()
+                    variant = variants.get(order_item.variant_id)
                     if variant:
                         variant.stock = (variant.stock or 0) + order_item.quantity
                         if variant.stock > 0:
                             variant.is_in_stock = True
                 else:
-                    product = db.query(Product).filter(Product.id == order_item.product_id).first()
+                    product = products.get(order_item.product_id)
                     if product:
                         product.stock = (product.stock or 0) + order_item.quantity
                         if product.stock > 0:
@@ -1784,10 +2182,13 @@ def update_order_status(order_id: int, data: OrderStatusUpdate, db: Session) ->
             logger.error(f"Error restoring stock for order #{order.id}: {e}", exc_info=True)
             # Continue anyway - stock restoration failure shouldn't block status update
     
+    # Build the response from the returned row before commit expires it,
+    # instead of refreshing and re-fetching the order through get_order
+    response = _order_to_admin_response(order, db)
     db.commit()
-    db.refresh(order)
+    invalidate_admin_stats_cache()
     
-    return get_order(order_id, db)
+    return response
 
 
 # ---------- Shipment Management ----------
@@ -2141,46 +2542,86 @@ def delete_order_shipment(order_id: int, shipment_id: int, db: Session) -> dict:
 
 # ---------- Stats ----------
 
+# Dashboard stats are polled often but only change on the scale of seconds.
+# Keep the last result in-process for a short TTL; admin order mutations
+# invalidate it, everything else (new checkouts, webhooks) ages out.
+ADMIN_STATS_CACHE_TTL_SECONDS = 20
+_admin_stats_cache: dict = {"value": None, "expires_at": 0.0}
+_admin_stats_lock = threading.Lock()
+
+
+def invalidate_admin_stats_cache() -> None:
+    """Drop the cached dashboard stats so the next request recomputes them"""
+    _admin_stats_cache["expires_at"] = 0.0
+
+
+# Any session that flushes an Order change (checkout, combine, shipments...)
+# drops the dashboard cache once it commits. Core UPDATE statements bypass the
+# flush, so those call invalidate_admin_stats_cache() themselves.
+@event.listens_for(Session, "after_flush")
+def _note_order_changes(session, flush_context):
+    if any(isinstance(obj, Order) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["orders_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stats_after_order_commit(session):
+    if session.info.pop("orders_changed", False):
+        invalidate_admin_stats_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_order_changes(session):
+    session.info.pop("orders_changed", None)
+
+
 def get_admin_stats(db: Session) -> AdminStats:
-    """Get admin dashboard statistics"""
-    total_orders = db.query(Order).count()
-    total_revenue = db.query(func.sum(Order.total)).filter(Order.payment_status == "completed").scalar() or 0
-    total_products = db.query(Product).count()
-    total_users = db.query(User).count()
+    """Get admin dashboard statistics (cached for ADMIN_STATS_CACHE_TTL_SECONDS)"""
+    cached = _admin_stats_cache["value"]
+    if cached is not None and time.monotonic() < _admin_stats_cache["expires_at"]:
+        return cached
+    
+    # Single-flight: only one thread recomputes on a miss, the rest reuse its result
+    with _admin_stats_lock:
+        cached = _admin_stats_cache["value"]
+        if cached is not None and time.monotonic() < _admin_stats_cache["expires_at"]:
+            return cached
+        stats = _compute_admin_stats(db)
+        _admin_stats_cache["value"] = stats
+        _admin_stats_cache["expires_at"] = time.monotonic() + ADMIN_STATS_CACHE_TTL_SECONDS
+        return stats
+
+
+def _compute_admin_stats(db: Session) -> AdminStats:
+    """Run the dashboard aggregate queries"""
+    # All scalar aggregates in one round trip, as scalar subqueries of a single SELECT
+    totals = db.execute(select(
+        select(func.count(Order.id)).scalar_subquery().label("total_orders"),
+        select(func.sum(Order.total)).where(Order.payment_status == "completed").scalar_subquery().label("total_revenue"),
+        select(func.count(Product.id)).scalar_subquery().label("total_products"),
+        select(func.count(User.id)).scalar_subquery().label("total_users"),
+    )).one()
+    total_orders = totals.total_orders
+    total_revenue = totals.total_revenue or 0
+    total_products = totals.total_products
+    total_users = totals.total_users
     
     # Orders by status
     status_counts = db.query(Order.status, func.count(Order.id)).group_by(Order.status).all()
     orders_by_status = {status: count for status, count in status_counts}
     
     # Recent orders (last 10)
-    recent = db.query(Order).order_by(Order.created_at.desc()).limit(10).all()
-    recent_orders = []
-    for order in recent:
-        items = []
-        for item in order.items:
-            product_name = item.product.name if item.product else "Unknown"
-            items.append(OrderItemResponse(
-                id=item.id,
-                product_id=item.product_id,
-                product_name=product_name,
-                quantity=item.quantity,
-                price=item.price
-            ))
-        recent_orders.append(OrderAdminResponse(
-            id=order.id,
-            session_id=order.session_id,
-            user_id=order.user_id,
-            shipping_method=order.shipping_method,
-            payment_method=order.payment_method,
-            address=order.address,
-            status=order.status,
-            payment_status=order.payment_status,
-            total=order.total,
-            created_at=order.created_at,
-            paid_at=order.paid_at,
-            stripe_payment_intent_id=order.stripe_payment_intent_id,
-            items=items
-        ))
+    recent = db.query(*_ORDER_RESPONSE_COLUMNS).order_by(Order.created_at.desc()).limit(10).all()
+    items = _order_items_by_order([order.id for order in recent], db)
+    recent_orders = [
+        _order_to_response(
+            order,
+            items=items[order.id],
+            address=RecipientAddress.model_validate(order.address) if order.address else None,
+            shipments=[],
+        )
+        for order in recent
+    ]
     
     return AdminStats(
         total_orders=total_orders,
@@ -2204,11 +2645,17 @@ def generate_temp_password() -> str:
     return secrets.token_urlsafe(24)
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt directly"""
+# Temp passwords are 192-bit random tokens that are never shown to anyone,
+# so bcrypt key stretching buys nothing; the minimum cost keeps the stored
+# value a valid bcrypt hash without spending ~250ms per admin-created user.
+TEMP_PASSWORD_BCRYPT_ROUNDS = 4
+
+
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt directly (BCRYPT_ROUNDS unless rounds is given)"""
     import bcrypt
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
     return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
 
 
@@ -2221,21 +2668,25 @@ def create_user_admin(data: UserAdminCreate, db: Session) -> UserAdminCreatedRes
             detail="At least one of phone, whatsapp_phone, or email must be provided"
         )
     
-    # Check for existing user with same phone, whatsapp_phone, or email
+    # Check for existing user with same phone, whatsapp_phone, or email in one query
+    # (at most one row per identifier thanks to the unique constraints)
+    identifier_filters = []
     if data.phone:
-        existing = db.query(User).filter(User.phone == data.phone).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Phone already registered")
-    
+        identifier_filters.append(User.phone == data.phone)
     if data.whatsapp_phone:
-        existing = db.query(User).filter(User.whatsapp_phone == data.whatsapp_phone).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="WhatsApp phone already registered")
-    
+        identifier_filters.append(User.whatsapp_phone == data.whatsapp_phone)
     if data.email:
-        existing = db.query(User).filter(User.email == data.email).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
+        identifier_filters.append(User.email == data.email)
+    
+    conflicts = db.execute(
+        select(User.phone, User.whatsapp_phone, User.email).where(or_(*identifier_filters))
+    ).all()
+    if data.phone and any(row.phone == data.phone for row in conflicts):
+        raise HTTPException(status_code=400, detail="Phone already registered")
+    if data.whatsapp_phone and any(row.whatsapp_phone == data.whatsapp_phone for row in conflicts):
+        raise HTTPException(status_code=400, detail="WhatsApp phone already registered")
+    if data.email and any(row.email == data.email for row in conflicts):
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Determine if this is a complete or partial registration
     is_complete = all([data.first_name, data.last_name, data.phone, data.email])
@@ -2253,21 +2704,22 @@ def create_user_admin(data: UserAdminCreate, db: Session) -> UserAdminCreatedRes
         birthdate=data.birthdate,
         user_type=data.user_type,
         registration_complete=is_complete,
-        hashed_password=get_password_hash(temp_password),  # Temp password
+        hashed_password=get_password_hash(temp_password, rounds=TEMP_PASSWORD_BCRYPT_ROUNDS),  # Temp password
         password_requires_update=True,  # User should set their own password
         password_last_updated=datetime.utcnow()
     )
     
     try:
         db.add(user)
-        db.commit()
-        db.refresh(user)
-    except Exception as e:
+        db.flush()
+    except IntegrityError as e:
         db.rollback()
-        error_msg = str(e)
-        if "UNIQUE constraint" in error_msg:
+        if _is_unique_violation(e):
             raise HTTPException(status_code=400, detail="User with this identifier already exists")
-        raise HTTPException(status_code=500, detail=f"Error creating user: {error_msg}")
+        raise HTTPException(status_code=500, detail=f"Error creating user: {e.orig}")
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error creating user: {e}")
     
     access_link = None
     
@@ -2277,7 +2729,9 @@ def create_user_admin(data: UserAdminCreate, db: Session) -> UserAdminCreatedRes
         token_obj = _create_single_access_token(user.id, redirect_url, db)
         access_link = f"{WHOLESALE_FRONTEND_URL}/auth?sat={token_obj.token}"
     
-    return UserAdminCreatedResponse(
+    # User and token commit together; the response is built first so the
+    # commit doesn't expire the instances and force a reload
+    response = UserAdminCreatedResponse(
         id=user.id,
         phone=user.phone,
         email=user.email,
@@ -2289,10 +2743,12 @@ def create_user_admin(data: UserAdminCreate, db: Session) -> UserAdminCreatedRes
         created_at=user.created_at,
         access_link=access_link
     )
+    db.commit()
+    return response
 
 
 def _create_single_access_token(user_id: int, redirect_url: str, db: Session) -> SingleAccessToken:
-    """Internal function to create a single-access token"""
+    """Internal function to create a single-access token (flushed; the caller commits)"""
     token = generate_single_access_token()
     expires_at = datetime.utcnow() + timedelta(hours=SINGLE_ACCESS_TOKEN_EXPIRE_HOURS)
     
@@ -2305,8 +2761,7 @@ def _create_single_access_token(user_id: int, redirect_url: str, db: Session) ->
     )
     
     db.add(token_obj)
-    db.commit()
-    db.refresh(token_obj)
+    db.flush()
     
     return token_obj
 
@@ -2317,15 +2772,14 @@ def create_single_access_token_for_user(
     db: Session
 ) -> SingleAccessTokenResponse:
     """Create a single-access token for an existing user"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if not db.query(User.id).filter(User.id == user_id).first():
         raise HTTPException(status_code=404, detail="User not found")
     
     redirect_url = data.redirect_url or WHOLESALE_FRONTEND_URL
     token_obj = _create_single_access_token(user_id, redirect_url, db)
     access_link = f"{WHOLESALE_FRONTEND_URL}/auth?sat={token_obj.token}"
     
-    return SingleAccessTokenResponse(
+    response = SingleAccessTokenResponse(
         id=token_obj.id,
         user_id=token_obj.user_id,
         token=token_obj.token,
@@ -2335,6 +2789,18 @@ def create_single_access_token_for_user(
         expires_at=token_obj.expires_at,
         used=token_obj.used
     )
+    db.commit()
+    return response
+
+
+# User columns a UserAdminResponse is built from. The listing selects these as
+# plain rows instead of hydrating User instances (and never reads password data).
+_USER_RESPONSE_COLUMNS = (
+    User.id, User.phone, User.whatsapp_phone, User.email, User.first_name, User.last_name,
+    User.birthdate, User.user_type, User.registration_complete, User.created_at,
+    User.is_suspended, User.suspended_at, User.suspended_reason,
+    User.is_blocked, User.blocked_at, User.blocked_reason,
+)
 
 
 def list_users(
@@ -2343,12 +2809,20 @@ def list_users(
     user_type: Optional[str] = None,
     registration_complete: Optional[bool] = None,
     page: int = 1,
-    page_size: int = 20
+    page_size: int = 20,
+    include_total: bool = True,
+    cursor: Optional[str] = None
 ) -> PaginatedUsersResponse:
-    """List users with filters and pagination"""
-    query = db.query(User)
+    """
+    List users with filters and pagination.
+    
+    Pass the previous response's next_cursor as cursor to page by keyset
+    (created_at, id) instead of OFFSET; page is ignored and no total is computed.
+    """
+    query = db.query(*_USER_RESPONSE_COLUMNS)
     
     if search:
+        # Backed by pg_trgm GIN indexes on Postgres (migration y0z1a2b3c4d5)
         search_filter = f"%{search}%"
         query = query.filter(
             (User.phone.ilike(search_filter)) |
@@ -2364,65 +2838,38 @@ def list_users(
     if registration_complete is not None:
         query = query.filter(User.registration_complete == registration_complete)
     
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.filter(_created_at_keyset_after(User.created_at, User.id, cursor_created_at, cursor_id))
+        page, include_total = 1, False
     
-    users = query.order_by(User.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
+    users, total_items, total_pages, has_next = _paginate(
+        query.order_by(*_created_at_keyset_order(User.created_at, User.id)), page, page_size, include_total
+    )
     
-    results = [UserAdminResponse.model_validate(user) for user in users]
+    results = [UserAdminResponse.model_validate(user._mapping) for user in users]
     
     return PaginatedUsersResponse(
         page=page,
         page_size=page_size,
         total_items=total_items,
         total_pages=total_pages,
+        has_next=has_next,
+        next_cursor=_encode_cursor(users[-1].created_at, users[-1].id) if has_next else None,
         results=results
     )
 
 
 def get_user_admin(user_id: int, db: Session) -> UserAdminResponse:
     """Get a single user by ID"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(*_USER_RESPONSE_COLUMNS).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserAdminResponse.model_validate(user)
+    return UserAdminResponse.model_validate(user._mapping)
 
 
-def validate_single_access_token(token: str, db: Session) -> dict:
-    """
-    Validate a single-access token from frontend.
-    Returns user info and JWT if valid, marks token as used.
-    
-    If token was already used but not expired:
-      - Returns valid=True, already_used=True, redirect_url (no new JWT)
-      - Frontend can redirect user if they're already logged in
-    """
-    token_obj = db.query(SingleAccessToken).filter(
-        SingleAccessToken.token == token
-    ).first()
-    
-    if not token_obj:
-        return {
-            "valid": False,
-            "already_used": False,
-            "message": "Token not found"
-        }
-    
-    # Check expiration first (applies to both used and unused tokens)
-    # Return redirect_url so frontend can redirect, but don't expose user data
-    if datetime.utcnow() > token_obj.expires_at:
-        return {
-            "valid": True,
-            "already_used": True,
-            "access_token": None,
-            "token_type": "bearer",
-            "redirect_url": token_obj.redirect_url or WHOLESALE_FRONTEND_URL,
-            "user": None,
-            "message": "Token has expired. Please request a new access link."
-        }
-    
-    # Get user
-    user = db.query(User).filter(User.id == token_obj.user_id).first()
+def _sat_user_error(user: Optional[User]) -> Optional[dict]:
+    """Return the error response for a single-access token whose user can't log in"""
     if not user:
         return {
             "valid": False,
@@ -2445,75 +2892,147 @@ def validate_single_access_token(token: str, db: Session) -> dict:
             "message": "Your account has been temporarily suspended. Please contact support."
         }
     
-    # If token already used, return success but with already_used=True
-    # No new JWT is generated, frontend should redirect if user is logged in
-    # Don't return user data for security - anyone with the link could see it
-    if token_obj.used:
+    return None
+
+
+# Tokens that can no longer be claimed (already used, or expired unused):
+# token -> (user_id, redirect_url, expires_at). Neither state can change back,
+# so repeat validations (frontend refreshes) skip the claim UPDATE and token
+# lookup; the user's block/suspend status is still read on every call. Only
+# committed state is cached: our own claim after its commit, or a row read back
+# as used/expired. A failed claim alone proves nothing (a concurrent claim may
+# still roll back and leave the token unused).
+_spent_sat_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+def validate_single_access_token(token: str, db: Session) -> dict:
+    """
+    Validate a single-access token from frontend.
+    Returns user info and JWT if valid, marks token as used.
+    
+    If token was already used but not expired:
+      - Returns valid=True, already_used=True, redirect_url (no new JWT)
+      - Frontend can redirect user if they're already logged in
+    """
+    now = datetime.utcnow()
+    spent = _spent_sat_cache.get(token)
+    
+    # First time use: claim the token atomically (compare-and-swap on used=False),
+    # so two concurrent requests can't both get a JWT for the same link
+    claimed = None if spent else db.execute(
+        update(SingleAccessToken)
+        .where(
+            SingleAccessToken.token == token,
+            SingleAccessToken.used == False,
+            SingleAccessToken.expires_at >= now
+        )
+        .values(used=True, used_at=utcnow())
+        .returning(SingleAccessToken.user_id, SingleAccessToken.redirect_url, SingleAccessToken.expires_at)
+    ).one_or_none()
+    
+    if claimed:
+        user = db.query(User).options(*RAISELOAD_OPTIONS).filter(User.id == claimed.user_id).first()
+        user_error = _sat_user_error(user)
+        if user_error:
+            # Leave the token unused for blocked/suspended/missing users
+            db.rollback()
+            return user_error
+        
+        # Create JWT access token for the user
+        # Use email, phone, or whatsapp_phone as identifier (in order of preference)
+        identifier = user.email or user.phone or user.whatsapp_phone
+        expires_delta = timedelta(days=365)
+        expire = datetime.utcnow() + expires_delta
+        
+        to_encode = {
+            "sub": identifier,
+            "exp": expire
+        }
+        access_token = encode_token(to_encode)
+        
+        # Built before commit, which would expire the user and force a reload
+        response = {
+            "valid": True,
+            "already_used": False,
+            "access_token": access_token,
+            "token_type": "bearer",
+            "redirect_url": claimed.redirect_url,
+            "user": UserAdminResponse.model_validate(user),
+            "message": "Token validated successfully"
+        }
+        db.commit()
+        _spent_sat_cache.set(token, (claimed.user_id, claimed.redirect_url, claimed.expires_at))
+        return response
+    
+    cache_hit = spent is not None
+    if not cache_hit:
+        # Not claimable: find out whether it's unknown, expired or already used
+        # (token and its user in one round trip; the token columns come from the
+        # covering index added in migration b3c4d5e6f7a8)
+        row = db.query(
+            SingleAccessToken.user_id, SingleAccessToken.redirect_url, SingleAccessToken.expires_at,
+            SingleAccessToken.used, User.is_blocked, User.is_suspended, User.id.label("found_user_id")
+        ).outerjoin(
+            User, User.id == SingleAccessToken.user_id
+        ).filter(SingleAccessToken.token == token).first()
+        
+        if not row:
+            return {
+                "valid": False,
+                "already_used": False,
+                "message": "Token not found"
+            }
+        user = row if row.found_user_id is not None else None
+        spent = (row.user_id, row.redirect_url, row.expires_at)
+        if row.used or now > row.expires_at:
+            _spent_sat_cache.set(token, spent)
+    user_id, redirect_url, expires_at = spent
+    
+    # Check expiration first (applies to both used and unused tokens)
+    # Return redirect_url so frontend can redirect, but don't expose user data
+    if now > expires_at:
         return {
             "valid": True,
             "already_used": True,
             "access_token": None,
             "token_type": "bearer",
-            "redirect_url": token_obj.redirect_url or WHOLESALE_FRONTEND_URL,
+            "redirect_url": redirect_url or WHOLESALE_FRONTEND_URL,
             "user": None,
-            "message": "Token validated successfully. User already authenticated."
-        }
-    
-    # First time use - mark as used
-    token_obj.used = True
-    token_obj.used_at = datetime.utcnow()
-    db.commit()
-    
-    # Get user
-    user = db.query(User).filter(User.id == token_obj.user_id).first()
-    if not user:
-        return {
-            "valid": False,
-            "message": "User not found"
-        }
-    
-    # Check if user is blocked
-    if user.is_blocked:
-        return {
-            "valid": False,
-            "message": "Your account has been blocked. Please contact support."
-        }
-    
-    # Check if user is suspended
-    if user.is_suspended:
-        return {
-            "valid": False,
-            "message": "Your account has been temporarily suspended. Please contact support."
+            "message": "Token has expired. Please request a new access link."
         }
     
-    # Create JWT access token for the user
-    # Use email, phone, or whatsapp_phone as identifier (in order of preference)
-    identifier = user.email or user.phone or user.whatsapp_phone
-    expires_delta = timedelta(days=365)
-    expire = datetime.utcnow() + expires_delta
-    
-    to_encode = {
-        "sub": identifier,
-        "exp": expire
-    }
-    access_token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    if cache_hit:
+        user = db.query(User.is_blocked, User.is_suspended).filter(User.id == user_id).first()
+    user_error = _sat_user_error(user)
+    if user_error:
+        return user_error
     
+    # Token already used, return success but with already_used=True
+    # No new JWT is generated, frontend should redirect if user is logged in
+    # Don't return user data for security - anyone with the link could see it
     return {
         "valid": True,
-        "already_used": False,
-        "access_token": access_token,
+        "already_used": True,
+        "access_token": None,
         "token_type": "bearer",
-        "redirect_url": token_obj.redirect_url,
-        "user": UserAdminResponse.model_validate(user),
-        "message": "Token validated successfully"
+        "redirect_url": redirect_url or WHOLESALE_FRONTEND_URL,
+        "user": None,
+        "message": "Token validated successfully. User already authenticated."
     }
 
 
 # ---------- User Suspension/Block Management ----------
 
+def _user_admin_response(user: User) -> UserAdminResponse:
+    """Build a UserAdminResponse from a loaded user without re-validating it"""
+    return UserAdminResponse.model_construct(
+        **{field: getattr(user, field) for field in UserAdminResponse.model_fields}
+    )
+
+
 def suspend_user(user_id: int, data: UserSuspendRequest, db: Session) -> UserActionResponse:
     """Suspend a user temporarily"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(*RAISELOAD_OPTIONS).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -2527,19 +3046,19 @@ def suspend_user(user_id: int, data: UserSuspendRequest, db: Session) -> UserAct
     user.suspended_at = datetime.utcnow()
     user.suspended_reason = data.reason
     
-    db.commit()
-    db.refresh(user)
-    
-    return UserActionResponse(
+    # Build the response from the values just set, before commit expires them
+    response = UserActionResponse(
         success=True,
         message=f"User '{user.first_name or user.email or user.phone}' has been suspended",
-        user=UserAdminResponse.model_validate(user)
+        user=_user_admin_response(user)
     )
+    db.commit()
+    return response
 
 
 def unsuspend_user(user_id: int, db: Session) -> UserActionResponse:
     """Remove suspension from a user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(*RAISELOAD_OPTIONS).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -2550,19 +3069,19 @@ def unsuspend_user(user_id: int, db: Session) -> UserActionResponse:
     user.suspended_at = None
     user.suspended_reason = None
     
-    db.commit()
-    db.refresh(user)
-    
-    return UserActionResponse(
+    # Build the response from the values just set, before commit expires them
+    response = UserActionResponse(
         success=True,
         message=f"User '{user.first_name or user.email or user.phone}' suspension has been lifted",
-        user=UserAdminResponse.model_validate(user)
+        user=_user_admin_response(user)
     )
+    db.commit()
+    return response
 
 
 def block_user(user_id: int, data: UserBlockRequest, db: Session) -> UserActionResponse:
     """Block a user permanently"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(*RAISELOAD_OPTIONS).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -2578,19 +3097,19 @@ def block_user(user_id: int, data: UserBlockRequest, db: Session) -> UserActionR
     user.blocked_at = datetime.utcnow()
     user.blocked_reason = data.reason
     
-    db.commit()
-    db.refresh(user)
-    
-    return UserActionResponse(
+    # Build the response from the values just set, before commit expires them
+    response = UserActionResponse(
         success=True,
         message=f"User '{user.first_name or user.email or user.phone}' has been blocked",
-        user=UserAdminResponse.model_validate(user)
+        user=_user_admin_response(user)
     )
+    db.commit()
+    return response
 
 
 def unblock_user(user_id: int, db: Session) -> UserActionResponse:
     """Remove block from a user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(*RAISELOAD_OPTIONS).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -2601,14 +3120,14 @@ def unblock_user(user_id: int, db: Session) -> UserActionResponse:
     user.blocked_at = None
     user.blocked_reason = None
     
-    db.commit()
-    db.refresh(user)
-    
-    return UserActionResponse(
+    # Build the response from the values just set, before commit expires them
+    response = UserActionResponse(
         success=True,
         message=f"User '{user.first_name or user.email or user.phone}' has been unblocked",
-        user=UserAdminResponse.model_validate(user)
+        user=_user_admin_response(user)
     )
+    db.commit()
+    return response
 
 
 # ---------- Shipping Rule Management ----------
@@ -3178,6 +3697,7 @@ def get_inventory_list(db: Session, search: Optional[str] = None) -> InventoryLi
     query = db.query(Product)
     
     if search:
+        # Backed by pg_trgm GIN indexes on Postgres (migration a2b3c4d5e6f7)
         search_filter = f"%{search}%"
         query = query.filter(
             (Product.name.ilike(search_filter)) |
@@ -3566,7 +4086,9 @@ def _registration_request_to_response(request: RegistrationRequest, db: Session)
     """Convert a RegistrationRequest model to a response schema"""
     reviewed_by = None
     if request.reviewed_by_id:
-        reviewer = db.query(User).filter(User.id == request.reviewed_by_id).first()
+        reviewer = db.query(User.id, User.first_name, User.last_name).filter(
+            User.id == request.reviewed_by_id
+        ).first()
         if reviewer:
             reviewed_by = RegistrationRequestReviewerResponse(
                 id=reviewer.id,
@@ -1,19 +1,21 @@
 from datetime import datetime, timedelta
+import hashlib
 import secrets
+import time
 import string
 from fastapi import HTTPException, Depends
-from jose import jwt, JWTError
 import bcrypt
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import bindparam, func, or_, select, union_all
 from fastapi.security import OAuth2PasswordBearer
 
-from database import get_db
+from database import get_db, RAISELOAD_OPTIONS
 from models import User, PasswordResetRequest, RegistrationRequest
 from schemas.auth import UserCreate, UserUpdate, ResetPasswordSchema
-from config import SECRET_KEY, ALGORITHM, FRONTEND_RESET_URL, PASSWORD_RESET_MAX_REQUESTS_PER_HOUR, get_store_config
+from config import FRONTEND_RESET_URL, PASSWORD_RESET_MAX_REQUESTS_PER_HOUR, BCRYPT_ROUNDS, get_store_config
 from utils import send_email
-from security import create_reset_token
+from utils.cache import TTLCache
+from security import create_reset_token, encode_token, decode_token, decode_bearer_token, JWTError, ExpiredSignatureError
 
 oauth2_scheme = None  # Defined in main auth.py for dependency injection
 
@@ -22,20 +24,28 @@ oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/login", auto_error=Fals
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt directly"""
+    """
+    Hash a password using bcrypt directly (cost from BCRYPT_ROUNDS).
+    Callers are sync routes, which FastAPI runs in its threadpool, and bcrypt
+    releases the GIL while hashing, so this never blocks the event loop.
+    """
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(BCRYPT_ROUNDS)
     return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
 
 
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+BCRYPT_HASH_LENGTH = 60  # "$2b$" + 2-digit cost + "$" + 22-char salt + 31-char digest
+
+
 def verify_password(plain: str, hashed: str) -> bool:
     """
     Verify a password against a hash using bcrypt directly.
     Returns False if hash format is invalid.
     """
     try:
-        # Check if it's a valid bcrypt hash
-        if not hashed or not hashed.startswith(('$2a$', '$2b$', '$2y$')):
+        # Check if it's a valid bcrypt hash (cheap shape check before any Blowfish work)
+        if not hashed or len(hashed) != BCRYPT_HASH_LENGTH or not hashed.startswith(BCRYPT_PREFIXES):
             return False
         plain_bytes = plain.encode('utf-8')
         hashed_bytes = hashed.encode('utf-8')
@@ -48,7 +58,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(days=365))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encode_token(to_encode)
 
 
 def _generate_request_code(db: Session) -> str:
@@ -60,10 +70,10 @@ def _generate_request_code(db: Session) -> str:
     for _ in range(10):  # Try up to 10 times
         code = 'REQ-' + ''.join(secrets.choice(chars) for _ in range(6))
         # Check if code already exists
-        existing = db.query(RegistrationRequest).filter(
-            RegistrationRequest.request_code == code
-        ).first()
-        if not existing:
+        taken = db.query(
+            db.query(RegistrationRequest.id).filter(RegistrationRequest.request_code == code).exists()
+        ).scalar()
+        if not taken:
             return code
     
     # Fallback: use timestamp-based code
@@ -95,7 +105,8 @@ def _validate_token_and_get_user(db: Session, token: str, raise_on_error: bool =
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Same cached decode as ActivityTrackingMiddleware, so this is normally a cache hit
+        payload = decode_bearer_token(token)
         identifier = payload.get("sub")
         if not identifier:
             if raise_on_error:
@@ -106,7 +117,7 @@ def _validate_token_and_get_user(db: Session, token: str, raise_on_error: bool =
             raise credentials_exception
         return None
     
-    user = get_user_by_email_or_phone(db, identifier)
+    user = _get_user_by_token_identifier(db, identifier)
     if not user:
         if raise_on_error:
             raise credentials_exception
@@ -133,6 +144,28 @@ def _validate_token_and_get_user(db: Session, token: str, raise_on_error: bool =
     return user
 
 
+# Token identifier (JWT sub) -> user id, so authenticated requests load the
+# user by primary key instead of the three-column OR lookup. The row itself is
+# still read on every request, so blocking/suspending takes effect at once; an
+# entry whose user no longer has that identifier (or is gone) is dropped.
+USER_ID_CACHE_TTL_SECONDS = 300
+_user_id_cache = TTLCache(maxsize=4096, ttl=USER_ID_CACHE_TTL_SECONDS)
+
+
+def _get_user_by_token_identifier(db: Session, identifier: str):
+    """get_user_by_email_or_phone, resolving repeat identifiers by primary key"""
+    user_id = _user_id_cache.get(identifier)
+    if user_id is not None:
+        user = db.get(User, user_id, options=RAISELOAD_OPTIONS)
+        if user is not None and identifier in (user.email, user.phone, user.whatsapp_phone):
+            return user
+        _user_id_cache.pop(identifier)
+    user = get_user_by_email_or_phone(db, identifier)
+    if user is not None:
+        _user_id_cache.set(identifier, user.id)
+    return user
+
+
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     """
     Requires authentication. Raises 401 if not authenticated.
@@ -209,20 +242,50 @@ def get_cart_user(
         return _validate_token_and_get_user(db, token, raise_on_error=False)
 
 
+# Built once: only the identifier is bound per call, so the lookup skips
+# per-call Query construction and always hits the compiled-statement cache.
+# One UNION ALL branch per identifier column (each has its own unique index),
+# so every branch is a single index probe instead of an OR across columns.
+_USER_BY_IDENTIFIER = select(User).options(*RAISELOAD_OPTIONS).from_statement(
+    union_all(
+        select(User).where(User.email == bindparam("identifier")),
+        select(User).where(User.phone == bindparam("identifier")),
+        select(User).where(User.whatsapp_phone == bindparam("identifier")),
+    ).limit(1)
+)
+
+
 def get_user_by_email_or_phone(db: Session, identifier: str):
     """Find user by email, phone, or whatsapp_phone"""
-    return db.query(User).filter(
-        or_(
-            User.email == identifier, 
-            User.phone == identifier,
-            User.whatsapp_phone == identifier
-        )
-    ).first()
+    return db.execute(_USER_BY_IDENTIFIER, {"identifier": identifier}).scalars().first()
+
+
+# Recent successful logins, so a burst of logins from one client doesn't
+# repeat bcrypt. Keys are a BLAKE2b MAC (random per-process key) of the
+# credentials; values are the bcrypt hash that was verified. A hit only counts
+# while the user's stored hash is unchanged, so a password change invalidates
+# it in every worker. Failed attempts are never cached.
+LOGIN_CACHE_TTL_SECONDS = 60
+_login_cache = TTLCache(maxsize=1024, ttl=LOGIN_CACHE_TTL_SECONDS)
+_LOGIN_CACHE_KEY = secrets.token_bytes(32)
+
+
+def _login_cache_key(identifier: str, password: str) -> bytes:
+    return hashlib.blake2b(
+        f"{identifier}\0{password}".encode('utf-8'), key=_LOGIN_CACHE_KEY, digest_size=16
+    ).digest()
+
 
 def authenticate_user(db: Session, identifier: str, password: str):
     user = get_user_by_email_or_phone(db, identifier)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not user.hashed_password:
+        return False
+    key = _login_cache_key(identifier, password)
+    if _login_cache.get(key) == user.hashed_password:
+        return user
+    if not verify_password(password, user.hashed_password):
         return False
+    _login_cache.set(key, user.hashed_password)
     return user
 
 def register_user(user: UserCreate, db: Session):
@@ -235,15 +298,27 @@ def register_user(user: UserCreate, db: Session):
     """
     from config import IS_RETAIL, IS_WHOLESALE
     
+    # Check email/phone (against every identifier column) and whatsapp_phone
+    # with one SELECT of EXISTS flags, so no user rows are fetched
+    identifiers = {user.email, user.phone}
+    checks = [
+        select(User.id).where(or_(
+            User.email.in_(identifiers),
+            User.phone.in_(identifiers),
+            User.whatsapp_phone.in_(identifiers),
+        )).exists()
+    ]
+    if user.whatsapp_phone:
+        checks.append(select(User.id).where(User.whatsapp_phone == user.whatsapp_phone).exists())
+    identifier_taken, *whatsapp_taken = db.execute(select(*checks)).one()
+    
     # Check if email/phone already registered
-    if get_user_by_email_or_phone(db, user.email) or get_user_by_email_or_phone(db, user.phone):
+    if identifier_taken:
         raise HTTPException(status_code=400, detail="Email or phone already registered")
     
     # Check whatsapp_phone if provided
-    if user.whatsapp_phone:
-        existing = db.query(User).filter(User.whatsapp_phone == user.whatsapp_phone).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="WhatsApp phone already registered")
+    if any(whatsapp_taken):
+        raise HTTPException(status_code=400, detail="WhatsApp phone already registered")
     
     config = get_store_config()
     hashed = get_password_hash(user.password)
@@ -310,15 +385,17 @@ def register_user(user: UserCreate, db: Session):
             )
         
         # Check if there's already a pending request with this email/phone
-        existing_request = db.query(RegistrationRequest).filter(
-            RegistrationRequest.status == "pending",
-            or_(
-                RegistrationRequest.email == user.email,
-                RegistrationRequest.phone == user.phone
-            )
-        ).first()
+        has_pending_request = db.query(
+            db.query(RegistrationRequest.id).filter(
+                RegistrationRequest.status == "pending",
+                or_(
+                    RegistrationRequest.email == user.email,
+                    RegistrationRequest.phone == user.phone
+                )
+            ).exists()
+        ).scalar()
         
-        if existing_request:
+        if has_pending_request:
             raise HTTPException(
                 status_code=400, 
                 detail="Ya existe una solicitud pendiente con este email o teléfono."
@@ -416,16 +493,17 @@ def login_user(form_data, db: Session):
 
 
 def request_password_reset(email: str, db: Session):
-    user = db.query(User).filter(User.email == email).first()
+    user = db.query(User.id).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Count recent reset attempts within the past hour
+    # (a plain COUNT(*) over ix_password_reset_requests_user_created)
     one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-    recent_attempts = db.query(PasswordResetRequest).filter(
+    recent_attempts = db.query(func.count()).select_from(PasswordResetRequest).filter(
         PasswordResetRequest.user_id == user.id,
         PasswordResetRequest.created_at >= one_hour_ago
-    ).count()
+    ).scalar()
 
     if recent_attempts >= PASSWORD_RESET_MAX_REQUESTS_PER_HOUR:
         raise HTTPException(
@@ -435,7 +513,7 @@ def request_password_reset(email: str, db: Session):
     db.query(PasswordResetRequest).filter(
         PasswordResetRequest.user_id == user.id,
         PasswordResetRequest.used == False
-    ).update({"used": True})
+    ).update({"used": True}, synchronize_session=False)
 
     token = create_reset_token({"user_id": user.id})
     reset_link = f"{FRONTEND_RESET_URL}{token}"
@@ -460,11 +538,13 @@ def request_password_reset(email: str, db: Session):
 
 def reset_password(data: ResetPasswordSchema, db: Session):
     try:
-        payload = jwt.decode(data.token, SECRET_KEY, algorithms=[ALGORITHM])
+        # jose verifies exp itself; require_exp rejects tokens without one
+        payload = decode_token(data.token, options={"require_exp": True})
         user_id = payload.get("user_id")
-        exp_timestamp = payload.get("exp")
-        if user_id is None or exp_timestamp is None:
+        if user_id is None:
             raise HTTPException(status_code=400, detail="Invalid token")
+    except ExpiredSignatureError:
+        raise HTTPException(status_code=400, detail="Token has expired.")
     except JWTError:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
 
@@ -472,9 +552,6 @@ def reset_password(data: ResetPasswordSchema, db: Session):
     if not reset_entry or reset_entry.used:
         raise HTTPException(status_code=400, detail="This reset link is invalid or already used.")
 
-    if datetime.utcnow().timestamp() > exp_timestamp:
-        raise HTTPException(status_code=400, detail="Token has expired.")
-
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -497,7 +574,7 @@ def get_user_by_id(user_id: int, current_user: User, db: Session):
             status_code=403, detail="You are not authorized to access this user's information."
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(*RAISELOAD_OPTIONS).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -598,10 +598,12 @@ def get_user_favorites(
 
 def is_product_favorite(db: Session, user: User, product_id: int) -> bool:
     """Check if a product is in user's favorites"""
-    return db.query(UserFavorite).filter(
-        UserFavorite.user_id == user.id,
-        UserFavorite.product_id == product_id
-    ).first() is not None
+    return db.query(
+        db.query(UserFavorite.id).filter(
+            UserFavorite.user_id == user.id,
+            UserFavorite.product_id == product_id
+        ).exists()
+    ).scalar()
 
 
 def get_user_favorite_ids(db: Session, user: User) -> List[int]:
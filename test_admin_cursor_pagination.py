@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Script to check keyset (cursor) pagination of the admin listings when the
+sort column is NULL for some rows:
+1. Orders and users with NULL created_at are paged by (created_at, id)
+2. Every row comes back exactly once, in the same order as one big page
+
+Runs against a throwaway SQLite database:
+    python test_admin_cursor_pagination.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Point the app at a temporary database before anything reads DATABASE_URL
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test_cursor.sqlite3')}"
+
+from database import Base, engine, SessionLocal
+from models import Order, User
+from services import admin_service
+
+PAGE_SIZE = 2
+
+
+def _seed(db) -> None:
+    base = datetime(2025, 1, 1)
+    # Mix of dated and NULL created_at rows, with dated ties
+    created = [base, None, base + timedelta(days=1), None, base, None, base + timedelta(days=2)]
+    for i, created_at in enumerate(created):
+        user = User(
+            first_name=f"User{i}", last_name="Test", email=f"user{i}@example.com",
+            phone=f"55500{i}", user_type="client",
+        )
+        db.add(user)
+        db.flush()
+        db.add(Order(user_id=user.id, status="pending", total=10, address={"street": "x"}))
+    db.commit()
+    # default=datetime.utcnow fills created_at on insert; blank out the ones meant to be NULL
+    for model in (User, Order):
+        for row, created_at in zip(db.query(model).order_by(model.id).all(), created):
+            row.created_at = created_at
+    db.commit()
+
+
+def _walk(fetch) -> list:
+    """Follow next_cursor from the first page to the last, collecting ids"""
+    ids, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        ids.extend(item.id for item in page.results)
+        if not page.next_cursor:
+            return ids
+        cursor = page.next_cursor
+
+
+def _check(name: str, paged: list, expected: list) -> bool:
+    if paged == expected:
+        print(f"[OK] {name}: {len(paged)} rows across cursor pages")
+        return True
+    print(f"[ERROR] {name}: cursor pages returned {paged}, expected {expected}")
+    return False
+
+
+def test_orders(db) -> bool:
+    expected = [o.id for o in admin_service.list_orders(db, page_size=100).results]
+    paged = _walk(lambda cursor: admin_service.list_orders(db, page_size=PAGE_SIZE, cursor=cursor))
+    return _check("orders", paged, expected)
+
+
+def test_users(db) -> bool:
+    expected = [u.id for u in admin_service.list_users(db, page_size=100).results]
+    paged = _walk(lambda cursor: admin_service.list_users(db, page_size=PAGE_SIZE, cursor=cursor))
+    return _check("users", paged, expected)
+
+
+def main() -> int:
+    print("=" * 60)
+    print("TEST: Admin cursor pagination with NULL sort keys")
+    print("=" * 60)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        _seed(db)
+        results = [test_orders(db), test_users(db)]
+    finally:
+        db.close()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
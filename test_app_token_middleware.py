@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Script to check app-token auth with ActivityTrackingMiddleware active:
+1. A valid app token is accepted by require_scope
+2. App tokens without exp or without sub are rejected (401)
+3. A tampered token is rejected (401)
+
+Runs the full app (middleware included) against a throwaway SQLite database:
+    python test_app_token_middleware.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Point the app at a temporary database before anything reads DATABASE_URL
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test_app_token.sqlite3')}"
+
+from fastapi.testclient import TestClient
+from database import Base, engine, SessionLocal
+from models import Application
+from security import encode_token
+from services import admin_service
+from main import app
+
+ENDPOINT = "/admin/applications"
+
+
+def _setup_application() -> Application:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        application = Application(
+            client_id="app_middleware_test",
+            client_secret_hash=admin_service.hash_secret("secret"),
+            name="Middleware test",
+            scopes=["applications:read"],
+            is_active=True,
+        )
+        db.add(application)
+        db.commit()
+        db.refresh(application)
+        db.expunge(application)
+        return application
+    finally:
+        db.close()
+
+
+def _status(client: TestClient, token: str) -> int:
+    return client.get(ENDPOINT, headers={"Authorization": f"Bearer {token}"}).status_code
+
+
+def test_app_token_claims(client: TestClient, application: Application) -> bool:
+    """App tokens must carry exp and sub even when the middleware decodes them first"""
+    expire = datetime.utcnow() + timedelta(minutes=5)
+    claims = {"sub": application.client_id, "type": "app", "scopes": ["applications:read"]}
+    valid, _ = admin_service.create_app_access_token(application)
+
+    cases = [
+        ("valid token", valid, 200),
+        ("token without exp", encode_token(claims), 401),
+        ("token without sub", encode_token({"type": "app", "scopes": ["applications:read"], "exp": expire}), 401),
+        ("tampered token", valid[:-2] + ("aa" if not valid.endswith("aa") else "bb"), 401),
+    ]
+
+    ok = True
+    for name, token, expected in cases:
+        status = _status(client, token)
+        if status == expected:
+            print(f"[OK] {name}: {status}")
+        else:
+            print(f"[ERROR] {name}: expected {expected}, got {status}")
+            ok = False
+    return ok
+
+
+def main() -> int:
+    print("=" * 60)
+    print("TEST: App token auth with ActivityTrackingMiddleware")
+    print("=" * 60)
+
+    if not any(m.cls.__name__ == "ActivityTrackingMiddleware" for m in app.user_middleware):
+        print("[ERROR] ActivityTrackingMiddleware is not registered")
+        return 1
+
+    application = _setup_application()
+    client = TestClient(app)
+    return 0 if test_app_token_claims(client, application) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())